@@ -0,0 +1,186 @@
+"""Local stand-in for api.ajax.systems, serving synthetic hubs and devices."""
+import asyncio
+import collections
+import itertools
+import random
+
+from aiohttp import web
+
+USER_ID = "bench-user"
+API_KEY = "bench-api-key"
+
+# Device types the integration maps, cycled through when building a hub
+DEVICE_TYPES = (
+    "DoorProtect",
+    "MotionProtect",
+    "FireProtectPlus",
+    "LeaksProtect",
+    "CombiProtect",
+    "GlassProtect",
+    "SpaceControl",
+    "Relay",
+    "HomeSiren",
+    "LifeQuality",
+)
+
+ARMING_STATES = {
+    "ARM": "ARMED_NIGHT_MODE_OFF",
+    "DISARM": "DISARMED_NIGHT_MODE_OFF",
+    "NIGHT_MODE_ON": "ARMED_NIGHT_MODE_ON",
+}
+
+
+def _device(hub_index, device_index):
+    device_type = DEVICE_TYPES[device_index % len(DEVICE_TYPES)]
+    return {
+        "id": f"{hub_index:04X}{device_index:04X}",
+        "deviceName": f"{device_type} {device_index}",
+        "deviceType": device_type,
+        "online": True,
+        "state": "PASSIVE",
+        "batteryChargeLevelPercentage": 100,
+        "temperature": 21,
+        "reedClosed": True,
+        "extraContactClosed": False,
+        "smokeAlarmDetected": False,
+        "coAlarmDetected": False,
+        "temperatureAlarmDetected": False,
+        "highTemperatureDiffDetected": False,
+        "leakDetected": False,
+        "humidity": 45,
+        "co2": 600,
+        "firmwareVersion": "5.57.1.0",
+        "signalLevel": "STRONG",
+        # Fields the integration never reads, as the real API sends plenty of them
+        "tampered": False,
+        "groupId": None,
+        "roomId": "0001",
+        "color": "WHITE",
+    }
+
+
+class MockAjaxCloud:
+    """aiohttp application emulating the Ajax cloud endpoints the integration calls."""
+
+    def __init__(self, hubs=1, devices_per_hub=10, latency=0.02, jitter=0.0, error_rate=0.0,
+                 churn=0.0, arming_delay=0.5, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        # Share of devices whose telemetry moves between two device list reads
+        self.churn = churn
+        self.arming_delay = arming_delay
+        # Answer /refresh like the real cloud does for an expired refresh token: 200 with an error body
+        self.reject_refresh = False
+        self._random = random.Random(seed)
+        self._tokens = itertools.count(1)
+        self.session_token = "session-0"
+        self.refresh_token = "refresh-0"
+        self.requests = collections.Counter()
+        self.hubs = {}
+        for hub_index in range(hubs):
+            hub_id = f"{hub_index:08X}"
+            self.hubs[hub_id] = {
+                "info": {
+                    "id": hub_id,
+                    "name": f"Hub {hub_index}",
+                    "state": "DISARMED_NIGHT_MODE_OFF",
+                    "online": True,
+                    "firmware": {"version": "2.19.0"},
+                },
+                "devices": [_device(hub_index, index) for index in range(devices_per_hub)],
+            }
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.add_routes([
+            web.post("/api/refresh", self._refresh),
+            web.get("/api/user/{user_id}/hubs", self._hubs),
+            web.get("/api/user/{user_id}/hubs/{hub_id}", self._hub_info),
+            web.get("/api/user/{user_id}/hubs/{hub_id}/devices", self._devices),
+            web.get("/api/user/{user_id}/hubs/{hub_id}/devices/{device_id}", self._device),
+            web.put("/api/user/{user_id}/hubs/{hub_id}/commands/arming", self._arming),
+        ])
+        self._runner = None
+        self._tasks = set()
+        self.base_url = None
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}/api"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_counts(self):
+        self.requests.clear()
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        resource = request.match_info.route.resource
+        route = resource.canonical if resource is not None else request.path
+        self.requests[f"{request.method} {route}"] += 1
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.json_response({"message": "Service unavailable"}, status=503)
+        if request.path != "/api/refresh" and request.headers.get("X-Session-Token") != self.session_token:
+            return web.json_response({"message": "User is not authorized"}, status=401)
+        return await handler(request)
+
+    def _hub(self, request):
+        hub = self.hubs.get(request.match_info["hub_id"])
+        if hub is None:
+            raise web.HTTPNotFound()
+        return hub
+
+    async def _refresh(self, request):
+        body = await request.json()
+        if self.reject_refresh:
+            return web.json_response({"message": "User is not authorized"})
+        if body.get("refreshToken") != self.refresh_token:
+            return web.json_response({"message": "User is not authorized"}, status=401)
+        token = next(self._tokens)
+        self.session_token = f"session-{token}"
+        self.refresh_token = f"refresh-{token}"
+        return web.json_response({"sessionToken": self.session_token, "refreshToken": self.refresh_token})
+
+    async def _hubs(self, request):
+        return web.json_response([{"hubId": hub_id, "hubBindingRole": "MASTER"} for hub_id in self.hubs])
+
+    async def _hub_info(self, request):
+        return web.json_response(self._hub(request)["info"])
+
+    async def _devices(self, request):
+        devices = self._hub(request)["devices"]
+        for device in devices:
+            if self.churn and self._random.random() < self.churn:
+                device["temperature"] = 18 + self._random.randint(0, 8)
+                device["batteryChargeLevelPercentage"] = max(0, device["batteryChargeLevelPercentage"] - 1)
+        return web.json_response(devices)
+
+    async def _device(self, request):
+        for device in self._hub(request)["devices"]:
+            if device["id"] == request.match_info["device_id"]:
+                return web.json_response(device)
+        raise web.HTTPNotFound()
+
+    async def _arming(self, request):
+        info = self._hub(request)["info"]
+        state = ARMING_STATES.get((await request.json()).get("command"))
+        if state is None:
+            return web.json_response({"message": "Unknown command"}, status=400)
+
+        async def settle():
+            # Real hubs take a moment before their reported state follows a command
+            await asyncio.sleep(self.arming_delay)
+            info["state"] = state
+
+        task = asyncio.get_running_loop().create_task(settle())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return web.Response(status=204)
@@ -0,0 +1,185 @@
+"""
+Benchmark the integration against the local mock cloud.
+
+Run from the repository root:
+
+    python -m benchmarks.run --hubs 1,10,100 --devices 10,100
+
+Every scenario runs inside a throwaway Home Assistant instance; nothing leaves 127.0.0.1.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from homeassistant import loader
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_test_home_assistant
+
+from custom_components.ajax import api as ajax_api
+from custom_components.ajax.const import DOMAIN
+
+from .mock_cloud import API_KEY, USER_ID, MockAjaxCloud
+
+# Concurrent callers racing an expired token in the refresh scenario; each reads a
+# different device, so coalescing can't merge them and every one checks the token
+REFRESH_CALLERS = 50
+
+
+class Scenario:
+    """Measures wall time, cloud requests and peak Python memory of one step."""
+
+    def __init__(self, cloud, results, hubs, devices, name):
+        self.cloud = cloud
+        self.results = results
+        self.row = {"hubs": hubs, "devices": devices, "scenario": name}
+
+    def __enter__(self):
+        self.cloud.reset_counts()
+        tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        return self.row
+
+    def __exit__(self, *exc_info):
+        self.row["wall_s"] = round(time.perf_counter() - self._started, 3)
+        self.row["requests"] = sum(self.cloud.requests.values())
+        self.row["by_route"] = dict(self.cloud.requests)
+        self.row["peak_mem_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        self.results.append(self.row)
+
+
+async def run_install(args, hubs, devices, results):
+    cloud = MockAjaxCloud(
+        hubs=hubs,
+        devices_per_hub=devices,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        churn=args.churn,
+        arming_delay=args.arming_delay,
+    )
+    ajax_api.AjaxAPI.base_url = await cloud.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            # Test instances hide custom integrations until this is cleared
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            # The webhook transport is off, so its HTTP dependencies are not needed
+            hass.config.components.update({"http", "webhook"})
+
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={
+                    "session_token": cloud.session_token,
+                    "refresh_token": cloud.refresh_token,
+                    "user_id": USER_ID,
+                    "api_key": API_KEY,
+                    "token_created_at": time.time(),
+                },
+            )
+            entry.add_to_hass(hass)
+
+            try:
+                with Scenario(cloud, results, hubs, devices, "setup") as row:
+                    assert await hass.config_entries.async_setup(entry.entry_id)
+                    entry_data = hass.data[DOMAIN][entry.entry_id]
+                    # Devices are discovered in the background once the panels are up
+                    while "complete" not in entry_data["setup_timing"]:
+                        await asyncio.sleep(0.01)
+                    await hass.async_block_till_done()
+                row["entities"] = len(hass.states.async_all())
+                for stage in ("hubs_known", "first_entity", "complete"):
+                    if stage in entry_data["setup_timing"]:
+                        row[f"{stage}_s"] = round(entry_data["setup_timing"][stage], 3)
+
+                coordinators = entry_data["coordinators"]
+                api = entry_data["api"]
+
+                # Setup just filled the response cache; every scenario below must reach the cloud
+                api.cache.clear()
+                with Scenario(cloud, results, hubs, devices, "poll_cycle"):
+                    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators.values()))
+                    await hass.async_block_till_done()
+
+                api.cache.clear()
+                with Scenario(cloud, results, hubs, devices, "token_refresh") as row:
+                    api.session_created_at = 0
+                    reads = [
+                        (hub_id, device_id)
+                        for hub_id, coordinator in coordinators.items()
+                        for device_id in coordinator.device_ids
+                    ][:REFRESH_CALLERS]
+                    await asyncio.gather(*(api.get_device_info(hub_id, device_id) for hub_id, device_id in reads))
+                    row["callers"] = len(reads)
+
+                hub_id = next(iter(coordinators))
+                entity_id = er.async_get(hass).async_get_entity_id(
+                    "alarm_control_panel", DOMAIN, f"ajax_{hub_id}_alarm"
+                )
+                for service in ("alarm_arm_away", "alarm_disarm"):
+                    with Scenario(cloud, results, hubs, devices, service) as row:
+                        await hass.services.async_call(
+                            "alarm_control_panel", service, {"entity_id": entity_id}, blocking=True
+                        )
+                        row["final_state"] = hass.states.get(entity_id).state
+
+                assert await hass.config_entries.async_unload(entry.entry_id)
+                await hass.async_block_till_done()
+            finally:
+                await cloud.stop()
+
+
+def _parse_sizes(value):
+    return [int(size) for size in value.split(",") if size]
+
+
+def _print_table(results):
+    columns = ("hubs", "devices", "scenario", "wall_s", "requests", "peak_mem_mb", "entities", "first_entity_s")
+    print(" ".join(f"{column:>14}" for column in columns))
+    for row in results:
+        print(" ".join(f"{str(row.get(column, '')):>14}" for column in columns))
+
+
+async def main(args):
+    tracemalloc.start()
+    results = []
+    for hubs in args.hubs:
+        for devices in args.devices:
+            await run_install(args, hubs, devices, results)
+    tracemalloc.stop()
+
+    _print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hubs", type=_parse_sizes, default=[1, 10, 100], help="comma separated hub counts")
+    parser.add_argument("--devices", type=_parse_sizes, default=[10, 100], help="comma separated devices per hub")
+    parser.add_argument("--latency", type=float, default=0.02, help="base response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--churn", type=float, default=0.05, help="share of devices changing per device read")
+    parser.add_argument("--arming-delay", type=float, default=0.5, help="seconds before a hub follows a command")
+    parser.add_argument("--rate", type=float, help="override the request rate limit (requests/s)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--debug", action="store_true", help="log the integration at DEBUG")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    if args.debug:
+        logging.getLogger("custom_components.ajax").setLevel(logging.DEBUG)
+    if args.rate:
+        # Read by AjaxAPI when it builds its scheduler
+        ajax_api.REQUEST_RATE = args.rate
+        ajax_api.REQUEST_BURST = max(ajax_api.REQUEST_BURST, int(args.rate))
+    asyncio.run(main(args))
@@ -7,8 +7,11 @@ from .const import DOMAIN
 from .api import AjaxAPI
 from .device_mapper import map_ajax_device
 from homeassistant.core import CoreState
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from .client_registry import async_release_client
+from .coordinator import TRANSIENT_ERRORS
 from .integration_startup import do_setup
+from .inventory import InventoryStore
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -33,28 +36,59 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     try:    
        
         setup_result = await do_setup(hass, entry)   
-            
+        if not setup_result:
+            await _async_release_entry(hass, entry)
+            return setup_result
+        hass.data[DOMAIN][entry.entry_id]["options"] = dict(entry.options)
+        entry.async_on_unload(entry.add_update_listener(_async_update_listener))
         return setup_result
 
 
-    except Exception as e:
-        _LOGGER.error(f"Ajax authorisation error: {e}")
-        raise ConfigEntryAuthFailed
+    except (ConfigEntryAuthFailed, ConfigEntryNotReady):
+        await _async_release_entry(hass, entry)
+        raise
+    except TRANSIENT_ERRORS as e:
+        # HA retries the setup with backoff; a flaky cloud is not an auth problem
+        await _async_release_entry(hass, entry)
+        raise ConfigEntryNotReady(f"Ajax cloud not reachable: {e}") from e
+    except Exception:
+        _LOGGER.exception("Unexpected error setting up Ajax entry")
+        await _async_release_entry(hass, entry)
+        raise
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    
+    entry_data = hass.data[DOMAIN].get(entry.entry_id, {})
 
     # Remove platforms (sensor, binary_sensor, etc.)
-    platforms = entry.data.get("platforms", [])
-    _LOGGER.error(f"PLATFORMS:{platforms}")
-    loaded_platforms = hass.data[DOMAIN][entry.entry_id].get("loaded_platforms", [])
-    _LOGGER.error(f"Loaded platforms to unload: {loaded_platforms}")
+    loaded_platforms = entry_data.get("loaded_platforms", [])
+    _LOGGER.debug("Loaded platforms to unload: %s", loaded_platforms)
 
-    if platforms:
-        _LOGGER.error("PLATFORMS TRUE")
+    unload_ok = True
+    if loaded_platforms:
         unload_ok = await hass.config_entries.async_unload_platforms(entry, loaded_platforms)
-        _LOGGER.error("PLATFORMS FALSE")
-        unload_ok = True
 
-    _LOGGER.error(f"UNLOAD:{unload_ok}")
-    return bool(unload_ok)
\ No newline at end of file
+    if unload_ok:
+        # Release pooled connections so reloads don't leak sockets
+        await _async_release_entry(hass, entry)
+
+    return bool(unload_ok)
+
+
+async def _async_release_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    entry_data = hass.data[DOMAIN].pop(entry.entry_id, {})
+    stream = entry_data.get("event_stream")
+    if stream is not None:
+        await stream.async_stop()
+    # Closes the shared client once no other entry of the account uses it
+    await async_release_client(hass, entry)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Drop the cached inventory along with the entry
+    await InventoryStore(hass, entry.entry_id).async_remove()
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Token refreshes also update the entry; only option changes need a reload
+    if hass.data[DOMAIN].get(entry.entry_id, {}).get("options") != dict(entry.options):
+        await hass.config_entries.async_reload(entry.entry_id)
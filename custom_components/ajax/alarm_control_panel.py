@@ -1,34 +1,47 @@
 from homeassistant.components.alarm_control_panel.const import AlarmControlPanelEntityFeature
 from homeassistant.components.alarm_control_panel import AlarmControlPanelEntity, AlarmControlPanelState
 from homeassistant.const import STATE_UNKNOWN
-from datetime import timedelta
-import time
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 import logging
-import asyncio
 
 from .api import AjaxAPI
-from .const import DOMAIN
+from .const import DOMAIN, CONFIRM_TIMEOUT
+from .entity import AjaxCoordinatorEntity
+from .inventory import signal_new_entities
 
 
-SCAN_INTERVAL = timedelta(seconds=15)
-
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     data = hass.data[DOMAIN][config_entry.entry_id]
-    api = hass.data[DOMAIN][config_entry.entry_id]["api"]
-    hubs = data.get("hubs", [])
-    entities = [AjaxAlarmPanel(api, hub["hubId"]) for hub in hubs]
-    async_add_entities(entities)
+
+    @callback
+    def async_add_hubs(hubs):
+        api = data["api"]
+        coordinators = data["coordinators"]
+        async_add_entities(AjaxAlarmPanel(coordinators[hub["hubId"]], api, hub["hubId"]) for hub in hubs)
+
+    async_add_hubs(data.get("hubs", []))
+    # Hubs added to the account later arrive without reloading the entry
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, signal_new_entities(config_entry.entry_id, "alarm_control_panel"), async_add_hubs
+        )
+    )
 
 
-class AjaxAlarmPanel(AlarmControlPanelEntity):
-    def __init__(self, api, hub_id):
+class AjaxAlarmPanel(AjaxCoordinatorEntity, AlarmControlPanelEntity):
+    def __init__(self, coordinator, api, hub_id):
+        super().__init__(coordinator)
         self.api = api
         self.hub_id = hub_id
         self._attr_name = "Ajax Hub"
         self._raw_state = STATE_UNKNOWN
+        # Set while an arming command waits for the hub to confirm it
+        self._pending_state = None
+        self._update_from_coordinator()
 
     def map_ajax_state_to_ha(self, state):
         if state in ["DISARMED_NIGHT_MODE_OFF", "DISARMED_NIGHT_MODE_ON"]:
@@ -48,47 +61,60 @@ class AjaxAlarmPanel(AlarmControlPanelEntity):
 
     @property
     def alarm_state(self):
+        if self._pending_state is not None:
+            return self._pending_state
         return self.map_ajax_state_to_ha(self._raw_state)
 
-    async def async_added_to_hass(self):
-        await self.async_update()
+    @property
+    def extra_state_attributes(self):
+        return {"stale": self.coordinator.stale}
 
-    async def async_update(self):
-        start = time.perf_counter()
-        hub_info = await self.api.get_hub_info(self.hub_id)
-        _LOGGER.error("API response time: %.2f sec", time.perf_counter() - start)
+    def _update_from_coordinator(self):
+        hub_info = self.coordinator.hub_info
         if not hub_info:
-            _LOGGER.warning("Hub info is not available for update")
             return
-
         self._raw_state = hub_info["state"]
         self._attr_name = f"{hub_info['name']} ({hub_info['id']})"
-        self.async_schedule_update_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self):
+        if not self.coordinator.hub_changed:
+            return
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
 
     async def async_alarm_disarm(self, code=None):
-        _LOGGER.info("Disarm called")
-        start = time.perf_counter()
+        _LOGGER.debug("Disarming hub %s", self.hub_id)
         await self.api.disarm_hub(self.hub_id)
-        _LOGGER.error("API disarm time: %.2f sec", time.perf_counter() - start)
-        await asyncio.sleep(1)
-        await self.async_update()
-        
+        await self._async_confirm_state(AlarmControlPanelState.DISARMING, AlarmControlPanelState.DISARMED)
 
     async def async_alarm_arm_away(self, code=None):
-        _LOGGER.info("Arm away called")
-        start = time.perf_counter()
+        _LOGGER.debug("Arming hub %s", self.hub_id)
         await self.api.arm_hub(self.hub_id)
-        _LOGGER.error("API arm time: %.2f sec", time.perf_counter() - start)
-        await asyncio.sleep(1)
-        await self.async_update()
-        
+        await self._async_confirm_state(AlarmControlPanelState.ARMING, AlarmControlPanelState.ARMED_AWAY)
 
     async def async_alarm_arm_night(self, code=None):
-        _LOGGER.info("Arm night called")
+        _LOGGER.debug("Arming hub %s in night mode", self.hub_id)
         await self.api.arm_hub_night(self.hub_id)
-        await asyncio.sleep(1)
-        await self.async_update()
-        
+        await self._async_confirm_state(AlarmControlPanelState.ARMING, AlarmControlPanelState.ARMED_NIGHT)
+
+    async def _async_confirm_state(self, transitional, target):
+        """Show the transitional state until the hub reports target or we give up."""
+        self._pending_state = transitional
+        # Through the filter too, so a later coordinator update is compared against what is shown
+        self._async_write_if_changed()
+        try:
+            converged = await self.coordinator.async_wait_for_hub_state(
+                lambda state: self.map_ajax_state_to_ha(state) == target, CONFIRM_TIMEOUT
+            )
+        finally:
+            self._pending_state = None
+        if not converged:
+            _LOGGER.warning("Hub %s did not report %s within %ss", self.hub_id, target, CONFIRM_TIMEOUT)
+        self._update_from_coordinator()
+        self._async_write_if_changed()
+        # Keep polling fast for a while in case the hub is still settling; the command is done
+        self.coordinator.start_boost()
 
     @property
     def code_format(self):
@@ -1,14 +1,41 @@
 import aiohttp
+import asyncio
 import logging
 import time
+import contextlib
 import functools
 from aiohttp import ClientResponseError
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import CoreState
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    TOKEN_LIFETIME,
+    TOKEN_REFRESH_MARGIN,
+    REQUEST_RATE,
+    REQUEST_BURST,
+    MAX_IN_FLIGHT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    CACHE_POLICIES,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_BYTES,
+)
+from .cache import ResponseCache
+from .decoding import iter_devices, read_json, slim_device
+from .log_helpers import TimingLogger, redact_headers
+from .metrics import ApiMetrics
+from .resilience import RETRY_STATUSES, RetryPolicy, parse_retry_after
+from .scheduler import RequestScheduler, PRIORITY_AUTH, PRIORITY_COMMAND, PRIORITY_POLL
 
 _LOGGER = logging.getLogger(__name__)
 
+RETRYABLE_ERRORS = (asyncio.TimeoutError, aiohttp.ClientConnectionError)
+# The server turned the request away before acting on it
+REJECTED_STATUSES = frozenset({429})
+
 class AjaxAPIError(Exception):
     """Exception raised for Ajax API errors."""
     pass
@@ -16,13 +43,16 @@ class AjaxAPIError(Exception):
 def handle_unauthorized(func):
     @functools.wraps(func)
     async def wrapper(self, *args, **kwargs):
+        generation = self._token_generation
         try:
             return await func(self, *args, **kwargs)
         except ClientResponseError as e:
             if e.status == 401:
-                _LOGGER.warning("Unauthorized! Trying to refresh token...")
+                _LOGGER.debug("%s got 401, refreshing token and retrying", func.__name__)
                 try:
-                    await self.update_refresh_token()
+                    # Someone else refreshed while we were waiting: just retry
+                    if generation == self._token_generation:
+                        await self.update_refresh_token()
                     return await func(self, *args, **kwargs)
                 except Exception as refresh_error:
                     _LOGGER.error("Token refresh failed: %s", refresh_error)
@@ -40,6 +70,8 @@ class AjaxAPI:
         self.refresh_token = data["refresh_token"]
         self.hass = hass
         self.entry = entry
+        # Every config entry using this client; rotated tokens are saved to all of them
+        self.entries = {entry.entry_id: entry} if entry else {}
         self.session = session
         self.headers = {
             "X-Session-Token": self.session_token,
@@ -47,10 +79,178 @@ class AjaxAPI:
         }
         self.session_created_at = data.get("token_created_at", time.time())
         self._reauth_in_progress = False
+        # Single-flight refresh: concurrent callers await the same task
+        self._refresh_task = None
+        self._token_generation = 0
+        self._unsub_proactive_refresh = None
+        self._proactive_refresh_enabled = False
+        # Every outgoing request waits here; commands overtake polling
+        self.scheduler = RequestScheduler(REQUEST_RATE, REQUEST_BURST, MAX_IN_FLIGHT)
+        self.retry_policy = RetryPolicy(RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+        self._timing = TimingLogger(_LOGGER)
+        self.metrics = ApiMetrics()
+        self.cache = ResponseCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES)
+        # Cache key -> (task, priority) of the GET in flight for it; identical requests await it
+        self._pending_gets = {}
+        # Every GET task still running, including ones no longer joinable
+        self._fetch_tasks = set()
+
+    @contextlib.asynccontextmanager
+    async def _request(self, method, url, priority=PRIORITY_POLL, endpoint="other", idempotent=True, **kwargs):
+        """
+        Send a request through the scheduler, retrying transient failures.
+
+        Requests that must not be repeated (idempotent=False) are only retried when the
+        server rejected them outright; after a timeout or 5xx it may already have acted.
+        """
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(priority)
+            self.metrics.record_in_flight(self.scheduler.in_flight)
+            started = time.perf_counter()
+            try:
+                resp = await self.session.request(method, url, **kwargs)
+            except RETRYABLE_ERRORS as err:
+                self.scheduler.release()
+                self.metrics.record_request(endpoint, time.perf_counter() - started, False)
+                delay = self.retry_policy.delay(attempt) if idempotent else None
+                if delay is None:
+                    raise
+                self.metrics.record_retry(endpoint)
+                _LOGGER.debug("%s %s failed (%s), retrying in %.1fs", method, url, err, delay)
+            except BaseException:
+                self.scheduler.release()
+                raise
+            else:
+                self._timing.log(time.perf_counter() - started, method, url, resp.status)
+                if resp.status not in RETRY_STATUSES:
+                    break
+                self.metrics.record_request(endpoint, time.perf_counter() - started, False)
+                delay = None
+                if idempotent or resp.status in REJECTED_STATUSES:
+                    delay = self.retry_policy.delay(attempt, parse_retry_after(resp.headers.get("Retry-After")))
+                if delay is None:
+                    # Out of retries: surface the failure instead of a bogus body
+                    resp.release()
+                    self.scheduler.release()
+                    resp.raise_for_status()
+                self.metrics.record_retry(endpoint)
+                _LOGGER.debug("%s %s returned %s, retrying in %.1fs", method, url, resp.status, delay)
+                resp.release()
+                self.scheduler.release()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        ok = resp.status < 400
+        try:
+            async with resp:
+                yield resp
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.scheduler.release()
+            # Includes reading and decoding the body
+            self.metrics.record_request(endpoint, time.perf_counter() - started, ok)
+
+    async def _cached_get(self, endpoint, key, url, decode, fresh=False, **kwargs):
+        """
+        GET through the response cache.
+
+        Fresh entries are returned without a request, stale ones within their grace period
+        are returned while a background refresh runs. fresh=True always asks the server,
+        still revalidating with the cached ETag/Last-Modified, and never joins a request
+        already in flight. Other concurrent identical GETs share a single request.
+        """
+        entry = self.cache.get(key)
+        if entry is not None and not fresh:
+            if entry.fresh:
+                self.cache.hits += 1
+                return entry.value
+            if entry.usable_stale:
+                self.cache.stale_hits += 1
+                self._start_fetch(endpoint, key, url, decode, **kwargs)
+                return entry.value
+        # Shielded: one cancelled caller must not abort the request for the others
+        return await asyncio.shield(self._start_fetch(endpoint, key, url, decode, join=not fresh, **kwargs))
+
+    async def _fetch_cached(self, endpoint, key, url, decode, cacheable=None, **kwargs):
+        await self.ensure_token_valid()
+        entry = self.cache.get(key)
+        headers = dict(self.headers)
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        async with self._request("GET", url, endpoint=endpoint, headers=headers, **kwargs) as resp:
+            if resp.status == 304 and entry is not None:
+                self.cache.touch(key)
+                return entry.value
+            value = await decode(resp)
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            size = resp.content_length
+
+        pending = self._pending_gets.get(key)
+        if pending is None or pending[0] is not asyncio.current_task():
+            # Superseded by a newer fetch or invalidated while in flight: may predate either
+            return value
+        if cacheable is None or cacheable(value):
+            ttl, stale_ttl = CACHE_POLICIES[endpoint]
+            self.cache.put(
+                key, value, ttl, stale_ttl, etag, last_modified,
+                size if size is not None else len(repr(value)),
+            )
+        else:
+            self.cache.pop(key)
+        return value
 
-    def is_token_expired(self):
+    def _start_fetch(self, endpoint, key, url, decode, join=True, **kwargs):
+        """
+        Return the GET in flight for key, starting one if there is none.
+
+        A caller more urgent than the request in flight, which may be queued behind a whole
+        poll cycle, starts its own; so does one that may not join (join=False). The new
+        request then replaces the old one for later callers and for the cache.
+        """
+        priority = kwargs.get("priority", PRIORITY_POLL)
+        pending = self._pending_gets.get(key)
+        if pending is not None and join and pending[1] <= priority:
+            self.metrics.record_coalesced(endpoint)
+            return pending[0]
+        self.cache.misses += 1
+        task = asyncio.ensure_future(self._fetch_cached(endpoint, key, url, decode, **kwargs))
+        self._pending_gets[key] = (task, priority)
+        self._fetch_tasks.add(task)
+        task.add_done_callback(functools.partial(self._fetch_done, key))
+        return task
+
+    def _fetch_done(self, key, task):
+        self._fetch_tasks.discard(task)
+        pending = self._pending_gets.get(key)
+        if pending is not None and pending[0] is task:
+            del self._pending_gets[key]
+        # Retrieved here too, as a background refresh may have nobody awaiting it
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.debug("GET %s failed: %s", key, task.exception())
+
+    def cancel_pending_requests(self):
+        for task in list(self._fetch_tasks):
+            task.cancel()
+
+    def invalidate_hub(self, hub_id):
+        """Forget what is cached or in flight about a hub whose state is about to change."""
+        self.cache.invalidate_hub(hub_id)
+        # Keys are (endpoint, hub_id, ...). Detached GETs still answer whoever awaits
+        # them, but nobody new joins them and their results are not cached.
+        for key in [key for key in self._pending_gets if len(key) > 1 and key[1] == hub_id]:
+            del self._pending_gets[key]
+
+    def is_token_expired(self, margin=0):
         # Token expires after 14 minutes
-        return time.time() - self.session_created_at > 14 * 60
+        return time.time() - self.session_created_at > TOKEN_LIFETIME - margin
     
     def is_refresh_token_old(self):
         # Refresh token expires after 7 days
@@ -58,22 +258,58 @@ class AjaxAPI:
         return time.time() - token_created_at > 7 * 24 * 60 * 60
 
     async def ensure_token_valid(self):
-        _LOGGER.error("Token is valid check")
-        if self.is_token_expired():
-            _LOGGER.error("Token expired, refreshing...")
+        if self.is_token_expired(TOKEN_REFRESH_MARGIN):
+            _LOGGER.debug("Session token about to expire, refreshing")
             await self.update_refresh_token()
 
+    def start_token_refresher(self):
+        """Refresh the session token shortly before it expires, off the request path."""
+        self.stop_token_refresher()
+        self._proactive_refresh_enabled = True
+        delay = max(0, self.session_created_at + TOKEN_LIFETIME - TOKEN_REFRESH_MARGIN - time.time())
+        self._unsub_proactive_refresh = async_call_later(self.hass, delay, self._proactive_refresh)
+
+    def stop_token_refresher(self):
+        self._proactive_refresh_enabled = False
+        if self._unsub_proactive_refresh is not None:
+            self._unsub_proactive_refresh()
+            self._unsub_proactive_refresh = None
+
+    async def _proactive_refresh(self, _now):
+        self._unsub_proactive_refresh = None
+        try:
+            await self.update_refresh_token()
+        except Exception as err:
+            # The request path will retry on demand and reschedule on success
+            _LOGGER.warning("Proactive token refresh failed: %s", err)
 
     async def update_refresh_token(self):
-        _LOGGER.error("Refreshing token")
-        _LOGGER.error(f"{self.hass.state}")
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._async_refresh_token())
+            self._refresh_task.add_done_callback(self._clear_refresh_task)
+        # Shield so one cancelled waiter doesn't abort the refresh for everyone
+        return await asyncio.shield(self._refresh_task)
+
+    def _clear_refresh_task(self, task):
+        self._refresh_task = None
+        if not task.cancelled():
+            # Retrieving the exception also marks it handled if every waiter was cancelled
+            self.metrics.record_token_refresh(task.exception() is None)
+
+    async def _async_refresh_token(self):
+        _LOGGER.debug("Refreshing session token (HA state: %s)", self.hass.state if self.hass else None)
         # if self.hass.state != "RUNNING":
         #     _LOGGER.warning("HA not running yet, skipping token refresh")
         #     return
         try:
 
-            async with self.session.post(
+            async with self._request(
+                "POST",
                 f"{self.base_url}/refresh",
+                priority=PRIORITY_AUTH,
+                endpoint="refresh",
+                # The refresh token rotates: a repeat after a lost response would send a spent one
+                idempotent=False,
                 json={
                     "userId": self.user_id,
                     "refreshToken": self.refresh_token
@@ -85,7 +321,7 @@ class AjaxAPI:
                 if resp.status == 401 or resp.status == 403:
                     # Неавторизованный — токен недействителен
                     text = await resp.text()
-                    _LOGGER.error(f"Refresh token unauthorized: {resp.status} {text}")
+                    _LOGGER.error("Refresh token unauthorized: %s %s", resp.status, text)
                     raise ConfigEntryAuthFailed(f"Unauthorized refresh token: {resp.status}")
 
                 resp.raise_for_status()  # выбросит исключение на другие ошибки HTTP
@@ -93,41 +329,44 @@ class AjaxAPI:
                 data = await resp.json()
                 # тут обновляем токены и т.д.
 
+        except ConfigEntryAuthFailed:
+            raise
         except aiohttp.ClientResponseError as e:
-            _LOGGER.error(f"HTTP error during token refresh: {e}")
-            raise ConfigEntryAuthFailed(f"HTTP error: {e}") from e
+            _LOGGER.error("HTTP error during token refresh: %s", e)
+            if e.status in (401, 403):
+                raise ConfigEntryAuthFailed(f"HTTP error: {e}") from e
+            # 5xx and the like: the refresh token is still good, try again later
+            raise AjaxAPIError(f"HTTP error during token refresh: {e}") from e
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            _LOGGER.error("Token refresh failed to reach the Ajax cloud: %s", e)
+            raise AjaxAPIError(f"Token refresh failed: {e}") from e
         except Exception as e:
-            _LOGGER.error(f"Unexpected error during token refresh: {e}")
+            _LOGGER.error("Unexpected error during token refresh: %s", e)
             raise ConfigEntryAuthFailed
 
         if ("sessionToken" not in data or
             "refreshToken" not in data or
             data.get("message") == "User is not authorized"):
-            _LOGGER.error(f"Failed to refresh token! Response: {data}")
+            _LOGGER.error("Failed to refresh token! Response: %s", data)
             # Check if refresh token is expired (older than 7 days)
             if hasattr(self, 'hass') and self.hass and hasattr(self, 'entry') and self.entry:
-                raise 
+                # The refresh token itself was refused: only signing in again helps
+                raise ConfigEntryAuthFailed(f"Refresh token rejected: {data}")
             raise AjaxAPIError(f"Refresh token expired or invalid. Please re-authenticate: {data}")
 
         self.session_token = data["sessionToken"]
         self.refresh_token = data["refreshToken"]
         self.headers["X-Session-Token"] = self.session_token
         self.session_created_at = time.time()    
+        self._token_generation += 1
+        if self._proactive_refresh_enabled:
+            self.start_token_refresher()
 
-        # Save new tokens to config entry
-        _LOGGER.error(f"HASS: {self.hass!r} ({bool(self.hass)}) ENTRY: {self.entry!r} ({bool(self.entry)})")
-        if self.hass and self.entry:
-            _LOGGER.error("TRUE")
-            self.hass.config_entries.async_update_entry(
-                self.entry,
-                data={
-                    **self.entry.data,
-                    "session_token": self.session_token,
-                    "refresh_token": self.refresh_token,
-                    "token_created_at": self.session_created_at,
-                }
-            )
-            _LOGGER.error("Entry updated with new tokens")
+        # Save new tokens to config entries
+        if self.hass and self.entries:
+            for entry in self.entries.values():
+                self._save_tokens(entry)
+            _LOGGER.debug("%d config entries updated with new tokens", len(self.entries))
             return True
         # Also update runtime data cache
         if hasattr(self.hass, "data") and hasattr(self.entry, "domain"):
@@ -136,16 +375,52 @@ class AjaxAPI:
                 "refresh_token": self.refresh_token,
                 "token_created_at": self.session_created_at,
             })
-            _LOGGER.error("Hass updated with new tokens")
+            _LOGGER.debug("Runtime data updated with new tokens")
             return True
         
 
+    def _save_tokens(self, entry):
+        self.hass.config_entries.async_update_entry(
+            entry,
+            data={
+                **entry.data,
+                "session_token": self.session_token,
+                "refresh_token": self.refresh_token,
+                "token_created_at": self.session_created_at,
+            }
+        )
+
+    def attach_entry(self, entry):
+        """Share this client with another config entry of the same account."""
+        self.entries[entry.entry_id] = entry
+        if self.entry is None:
+            self.entry = entry
+        created_at = entry.data.get("token_created_at", 0)
+        if created_at > self.session_created_at:
+            # The entry holds a newer token pair than we do
+            self.session_token = entry.data["session_token"]
+            self.refresh_token = entry.data["refresh_token"]
+            self.headers["X-Session-Token"] = self.session_token
+            self.session_created_at = created_at
+            self._token_generation += 1
+        elif created_at < self.session_created_at and self.hass:
+            # Its refresh token has been rotated away; store the current pair
+            self._save_tokens(entry)
+
+    def detach_entry(self, entry_id):
+        self.entries.pop(entry_id, None)
+        if self.entry is not None and self.entry.entry_id == entry_id:
+            self.entry = next(iter(self.entries.values()), None)
+
     @handle_unauthorized
     async def get_hubs(self):
         await self.ensure_token_valid()
-        _LOGGER.error("HEADERS: %s", self.headers)
-        async with self.session.get(
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Fetching hubs with headers %s", redact_headers(self.headers))
+        async with self._request(
+            "GET",
             f"{self.base_url}/user/{self.user_id}/hubs",
+            endpoint="hubs",
             headers=self.headers
         ) as resp:
             data = await resp.json()
@@ -158,7 +433,7 @@ class AjaxAPI:
 
             # Try to refresh the token
             refreshed = await self.update_refresh_token()
-            _LOGGER.error(f"REFRESHED:{refreshed}")
+            _LOGGER.debug("Token refreshed after unauthorized hubs response: %s", refreshed)
         
 
             if not refreshed:
@@ -169,47 +444,55 @@ class AjaxAPI:
         
         # Ensure we return a list
         if not isinstance(data, list):
-            _LOGGER.error("Expected list of hubs, got: %s", type(data))
-            _LOGGER.error("HUBS got: %s", data)
+            _LOGGER.error("Expected list of hubs, got %s: %s", type(data), data)
             return []
             
         return data
 
     @handle_unauthorized
-    async def get_hub_info(self, hub_id):
-        start = time.perf_counter()
-        await self.ensure_token_valid()
-        async with self.session.get(
-            f"{self.base_url}/user/{self.user_id}/hubs/{hub_id}",
-            headers=self.headers
-        ) as resp:
-            info = await resp.json()
+    async def get_hub_info(self, hub_id, priority=PRIORITY_POLL, fresh=False):
+        url = f"{self.base_url}/user/{self.user_id}/hubs/{hub_id}"
+        # Only real hub info is cached, never an error body
+        cacheable = lambda info: isinstance(info, dict) and "state" in info
+
+        async def decode(resp):
+            try:
+                return await read_json(resp)
+            except ValueError as err:
+                raise AjaxAPIError(f"Invalid hub info for {hub_id}: {err}") from err
+
+        info = await self._cached_get(
+            "hub_info", ("hub_info", hub_id), url, decode,
+            fresh=fresh, cacheable=cacheable, priority=priority,
+        )
         if info.get("message") == "User is not authorized":
-            _LOGGER.warning("User not authorized in hub_info body, refreshing token...")
+            _LOGGER.debug("User not authorized in hub_info body, refreshing token")
             await self.update_refresh_token()
-    
-            async with self.session.get(
-                f"{self.base_url}/user/{self.user_id}/hubs/{hub_id}",
-                headers=self.headers
-            ) as resp:
-                info = await resp.json()
+            info = await self._cached_get(
+                "hub_info", ("hub_info", hub_id), url, decode,
+                fresh=True, cacheable=cacheable, priority=priority,
+            )
         if "state" not in info:
-            _LOGGER.error("No 'state' in hub info response: %s", info)
-            return None
-        _LOGGER.error("API get hub info_time: %.2f sec", time.perf_counter() - start)
-        _LOGGER.error(f"API get hub info: {info["state"]}")
+            # Treated as a transient failure by callers, like any other bad response
+            raise AjaxAPIError(f"No 'state' in hub info response: {info}")
+        _LOGGER.debug("Hub %s state: %s", hub_id, info["state"])
         return info
 
     @handle_unauthorized
     async def arm_hub(self, hub_id):
         await self.ensure_token_valid()
         url = f"{self.base_url}/user/{self.user_id}/hubs/{hub_id}/commands/arming"
+        # The hub is about to change; nothing cached about it is current anymore
+        self.invalidate_hub(hub_id)
         payload = {
             "command": "ARM",
             "ignoreProblems": True
         }
        
-        async with self.session.put(url, json=payload, headers=self.headers) as resp:
+        async with self._request(
+            "PUT", url, priority=PRIORITY_COMMAND, endpoint="command", idempotent=False,
+            json=payload, headers=self.headers,
+        ) as resp:
             if resp.status == 204:
                 _LOGGER.info("Command sent successfully, no content returned.")
                 return None
@@ -222,12 +505,16 @@ class AjaxAPI:
     async def disarm_hub(self, hub_id):
         await self.ensure_token_valid()
         url = f"{self.base_url}/user/{self.user_id}/hubs/{hub_id}/commands/arming"
+        self.invalidate_hub(hub_id)
         payload = {
             "command": "DISARM",
             "ignoreProblems": True
         }
 
-        async with self.session.put(url, json=payload, headers=self.headers) as resp:
+        async with self._request(
+            "PUT", url, priority=PRIORITY_COMMAND, endpoint="command", idempotent=False,
+            json=payload, headers=self.headers,
+        ) as resp:
             if resp.status == 204:
                 _LOGGER.info("Command sent successfully, no content returned.")
                 return None
@@ -240,12 +527,16 @@ class AjaxAPI:
     async def arm_hub_night(self, hub_id):
         await self.ensure_token_valid()
         url = f"{self.base_url}/user/{self.user_id}/hubs/{hub_id}/commands/arming"
+        self.invalidate_hub(hub_id)
         payload = {
             "command": "NIGHT_MODE_ON",
             "ignoreProblems": True
         }
   
-        async with self.session.put(url, json=payload, headers=self.headers) as resp:
+        async with self._request(
+            "PUT", url, priority=PRIORITY_COMMAND, endpoint="command", idempotent=False,
+            json=payload, headers=self.headers,
+        ) as resp:
             if resp.status == 204:
                 _LOGGER.info("Night mode command sent successfully, no content returned.")
                 return None
@@ -255,31 +546,45 @@ class AjaxAPI:
         return result
 
     @handle_unauthorized
-    async def get_hub_devices(self, hub_id):
-        await self.ensure_token_valid()
+    async def get_hub_devices(self, hub_id, enrich=False, fresh=False):
         url = f"{self.base_url}/user/{self.user_id}/hubs/{hub_id}/devices"
-       
-        async with self.session.get(url, headers=self.headers) as resp:
+        # enrich=true returns the full device state, not just the inventory
+        params = {"enrich": "true"} if enrich else None
+
+        async def decode(resp):
             if resp.status == 204:
-                _LOGGER.info("No content returned for devices.")
+                _LOGGER.debug("No content returned for devices of hub %s", hub_id)
                 return None
-            else:
-                result = await resp.json()
-        return result
+            try:
+                # Decoded device by device; only the fields the integration reads are kept
+                return [device async for device in iter_devices(resp)]
+            except ValueError as err:
+                raise AjaxAPIError(f"Invalid device list for hub {hub_id}: {err}") from err
+
+        return await self._cached_get(
+            "hub_devices", ("hub_devices", hub_id, enrich), url, decode, fresh=fresh, params=params
+        )
 
    
             
 
     @handle_unauthorized
-    async def get_device_info(self, hub_id, device_id):
-        await self.ensure_token_valid()
+    async def get_device_info(self, hub_id, device_id, fresh=False):
         url = f"{self.base_url}/user/{self.user_id}/hubs/{hub_id}/devices/{device_id}"
-    
-        async with self.session.get(url, headers=self.headers) as resp:
+        # An error body is slimmed down to {}; only a real device is cached
+        cacheable = lambda device: isinstance(device, dict) and "id" in device
+
+        async def decode(resp):
             if resp.status == 204:
-                _LOGGER.info("No content returned for device info.")
+                _LOGGER.debug("No content returned for device %s", device_id)
                 return None
-            else:
-                result = await resp.json()
-        return result
+            try:
+                return slim_device(await read_json(resp))
+            except ValueError as err:
+                raise AjaxAPIError(f"Invalid device info for {device_id}: {err}") from err
+
+        return await self._cached_get(
+            "device_info", ("device_info", hub_id, device_id), url, decode,
+            fresh=fresh, cacheable=cacheable,
+        )
 
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+
+
+class CacheEntry:
+    __slots__ = ("value", "stored_at", "ttl", "stale_ttl", "etag", "last_modified", "size")
+
+    def __init__(self, value, ttl, stale_ttl, etag, last_modified, size):
+        self.value = value
+        self.stored_at = time.monotonic()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+
+    @property
+    def age(self):
+        return time.monotonic() - self.stored_at
+
+    @property
+    def fresh(self):
+        return self.age < self.ttl
+
+    @property
+    def usable_stale(self):
+        """Past its TTL but still allowed to be served while a refresh runs."""
+        return self.age < self.ttl + self.stale_ttl
+
+
+class ResponseCache:
+    """LRU cache of decoded API responses, bounded by entry count and approximate size."""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the entry for key, marking it recently used, or None."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value, ttl, stale_ttl, etag=None, last_modified=None, size=0):
+        self.pop(key)
+        self._entries[key] = CacheEntry(value, ttl, stale_ttl, etag, last_modified, size)
+        self.size += size
+        while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+
+    def touch(self, key):
+        """Restart the TTL of an entry the server confirmed unchanged."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.stored_at = time.monotonic()
+            self.not_modified += 1
+
+    def pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def invalidate_hub(self, hub_id):
+        """Drop every cached response of one hub; keys are (endpoint, hub_id, ...)."""
+        for key in [key for key in self._entries if len(key) > 1 and key[1] == hub_id]:
+            self.pop(key)
+
+    def as_dict(self):
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,74 @@
+import logging
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from homeassistant.util.ssl import get_default_context
+
+from .api import AjaxAPI
+from .const import (
+    DATA_CLIENTS,
+    REQUEST_TIMEOUT,
+    CONNECTION_LIMIT,
+    KEEPALIVE_TIMEOUT,
+    DNS_CACHE_TTL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def create_session():
+    """Create the client session, keeping connections to the cloud alive between polls."""
+    connector = TCPConnector(
+        limit=CONNECTION_LIMIT,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        ssl=get_default_context(),
+    )
+    return ClientSession(connector=connector, timeout=ClientTimeout(total=REQUEST_TIMEOUT))
+
+
+def _client_key(data):
+    return data["user_id"], data["api_key"]
+
+
+class SharedClient:
+    """One AjaxAPI and session per Ajax account, reference counted by config entry."""
+
+    def __init__(self, api, session):
+        self.api = api
+        self.session = session
+        self.entry_ids = set()
+
+
+def async_acquire_client(hass, entry):
+    """Return the account's AjaxAPI, creating it for the first entry that needs it."""
+    clients = hass.data.setdefault(DATA_CLIENTS, {})
+    key = _client_key(entry.data)
+    client = clients.get(key)
+    if client is None:
+        session = create_session()
+        client = clients[key] = SharedClient(AjaxAPI(entry.data, hass, entry, session), session)
+    else:
+        _LOGGER.debug("Entry %s shares the Ajax client of %s", entry.entry_id, sorted(client.entry_ids))
+        client.api.attach_entry(entry)
+    client.entry_ids.add(entry.entry_id)
+    return client.api
+
+
+async def async_release_client(hass, entry):
+    """Drop the entry's reference; the last one out stops the client and closes its session."""
+    clients = hass.data.get(DATA_CLIENTS, {})
+    # Looked up by entry rather than by entry.data, which reauth may have changed
+    key, client = next(
+        ((key, client) for key, client in clients.items() if entry.entry_id in client.entry_ids),
+        (None, None),
+    )
+    if client is None:
+        return
+    client.entry_ids.discard(entry.entry_id)
+    client.api.detach_entry(entry.entry_id)
+    if client.entry_ids:
+        return
+    del clients[key]
+    client.api.stop_token_refresher()
+    client.api.cancel_pending_requests()
+    await client.session.close()
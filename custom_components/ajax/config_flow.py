@@ -1,13 +1,20 @@
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
-import aiohttp
 import logging
 import time
 from typing import Any
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_DISCOVERY_CONCURRENCY,
+    DEFAULT_DISCOVERY_CONCURRENCY,
+    CONF_EVENT_TRANSPORT,
+    EVENT_TRANSPORT_NONE,
+    EVENT_TRANSPORT_WEBHOOK,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +25,11 @@ class AjaxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self.reauth_entry = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return AjaxOptionsFlow()
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
         # Get current platforms from reauth_entry.data if exists
         platforms = []
@@ -25,16 +37,16 @@ class AjaxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             platforms = self.reauth_entry.data["platforms"]
         if user_input is not None:
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        "https://api.ajax.systems/api/login",
-                        json={
-                            "login": user_input["login"],
-                            "passwordHash": user_input["password"]
-                        },
-                        headers={"X-Api-Key": user_input["api_key"]},
-                    ) as resp:
-                        data = await resp.json()
+                session = async_get_clientsession(self.hass)
+                async with session.post(
+                    "https://api.ajax.systems/api/login",
+                    json={
+                        "login": user_input["login"],
+                        "passwordHash": user_input["password"]
+                    },
+                    headers={"X-Api-Key": user_input["api_key"]},
+                ) as resp:
+                    data = await resp.json()
 
                 if resp.status != 200 or "sessionToken" not in data:
                     return self.async_show_form(
@@ -103,7 +115,7 @@ class AjaxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_reauth(self, entry_data: dict[str, Any]) -> FlowResult:
         """Perform reauth upon an API authentication error."""
-        _LOGGER.error("reauth CALLED")
+        _LOGGER.debug("Reauth requested for entry %s", self.context.get("entry_id"))
         self.reauth_entry = self.hass.config_entries.async_get_entry(
             self.context["entry_id"]
         )
@@ -150,3 +162,25 @@ class AjaxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Required("password"): str,
             vol.Required("api_key", default=api_key): str,
         })
+
+
+class AjaxOptionsFlow(config_entries.OptionsFlow):
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Tune discovery and choose how hub events are received."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_DISCOVERY_CONCURRENCY,
+                    default=options.get(CONF_DISCOVERY_CONCURRENCY, DEFAULT_DISCOVERY_CONCURRENCY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                vol.Required(
+                    CONF_EVENT_TRANSPORT,
+                    default=options.get(CONF_EVENT_TRANSPORT, EVENT_TRANSPORT_NONE),
+                ): vol.In([EVENT_TRANSPORT_NONE, EVENT_TRANSPORT_WEBHOOK]),
+            }),
+        )
@@ -1 +1,72 @@
+from datetime import timedelta
+
 DOMAIN = "ajax"
+# hass.data key of the per-account shared clients
+DATA_CLIENTS = f"{DOMAIN}_clients"
+
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
+
+CONF_DISCOVERY_CONCURRENCY = "discovery_concurrency"
+DEFAULT_DISCOVERY_CONCURRENCY = 4
+
+REQUEST_TIMEOUT = 10
+CONNECTION_LIMIT = 20
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+
+# Session token lives 14 minutes; refresh it a minute early
+TOKEN_LIFETIME = 14 * 60
+TOKEN_REFRESH_MARGIN = 60
+
+# Outgoing request budget per API client
+REQUEST_RATE = 5
+REQUEST_BURST = 10
+MAX_IN_FLIGHT = 6
+
+# Transient failures (429/5xx/timeouts)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30
+
+# Per-hub circuit breaker; while open, the hub is polled at most every retry window
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RECOVERY_TIME = 60
+BREAKER_MAX_RECOVERY_TIME = 15 * 60
+
+# Adaptive polling: fast while something is happening, slow when idle
+FAST_SCAN_INTERVAL = timedelta(seconds=3)
+ARMED_SCAN_INTERVAL = timedelta(seconds=10)
+IDLE_SCAN_INTERVAL = timedelta(minutes=5)
+COMMAND_BOOST_DURATION = 60
+
+# Confirming an arming command: poll with growing gaps until the hub agrees
+CONFIRM_TIMEOUT = 15
+CONFIRM_INITIAL_DELAY = 0.25
+CONFIRM_MAX_DELAY = 2
+
+# How often the device list of every hub is checked for added/removed devices
+INVENTORY_SCAN_INTERVAL = timedelta(minutes=10)
+
+# Pushed events stand in for fast polling of a hub only while they keep arriving
+PUSH_TIMEOUT = 30 * 60
+
+CONF_EVENT_TRANSPORT = "event_transport"
+EVENT_TRANSPORT_NONE = "none"
+EVENT_TRANSPORT_WEBHOOK = "webhook"
+
+# Request timings are logged at DEBUG for one call in TIMING_LOG_SAMPLE, and for every slow one
+TIMING_LOG_SAMPLE = 20
+SLOW_REQUEST_THRESHOLD = 2.0
+
+# Response cache: endpoint -> (TTL, seconds past the TTL a stale copy may still be served
+# while it refreshes in the background). Hub state and device lists stay below
+# FAST_SCAN_INTERVAL and are never served stale, so every poll still revalidates them.
+# Only device_info is served stale, and nothing in the integration reads single devices
+# at the moment: polling and inventory both use the device list.
+CACHE_POLICIES = {
+    "hub_info": (2, 0),
+    "hub_devices": (2, 0),
+    "device_info": (5, 30),
+}
+CACHE_MAX_ENTRIES = 1024
+CACHE_MAX_BYTES = 8 * 1024 * 1024
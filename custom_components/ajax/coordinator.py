@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+import aiohttp
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import AjaxAPIError
+from .const import (
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    FAST_SCAN_INTERVAL,
+    ARMED_SCAN_INTERVAL,
+    IDLE_SCAN_INTERVAL,
+    COMMAND_BOOST_DURATION,
+    CONFIRM_INITIAL_DELAY,
+    CONFIRM_MAX_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RECOVERY_TIME,
+    BREAKER_MAX_RECOVERY_TIME,
+    PUSH_TIMEOUT,
+)
+from .device_state import ALL_FIELDS, DeviceState
+from .event_stream import STATEFUL_ACTIONS
+from .resilience import CircuitBreaker
+from .scheduler import PRIORITY_COMMAND, request_owner
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSIENT_ERRORS = (AjaxAPIError, aiohttp.ClientError, asyncio.TimeoutError)
+
+# Detectors that stay armed around the clock, so their hub is never fully idle
+ALWAYS_ARMED_TYPES = frozenset({"fireprotect", "fireprotectplus", "leaksprotect"})
+
+
+def _alarm_active(devices):
+    return any(state.alarm_active for state in devices.values())
+
+
+def _has_always_armed_devices(devices):
+    return any(
+        (state.device_type or "").lower() in ALWAYS_ARMED_TYPES
+        for state in devices.values()
+    )
+
+
+class AjaxHubCoordinator(DataUpdateCoordinator):
+    """Fetches the hub state and the state of all its devices once per interval.
+
+    data maps device id -> DeviceState; the same objects are updated in place on
+    every refresh, so entities can hold on to them.
+    """
+
+    def __init__(self, hass, entry, api, hub_id, devices):
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN}_hub_{hub_id}",
+            update_interval=DEFAULT_SCAN_INTERVAL,
+        )
+        self.api = api
+        self.hub_id = hub_id
+        self.device_ids = [device.get("id") for device in devices or [] if device.get("id")]
+        self.hub_info = None
+        self.hub_changed = True
+        # device id -> names of the DeviceState fields changed by the last refresh;
+        # None means every field of every device must be treated as changed
+        self.changed_fields = None
+        # Shared by everything polling this hub so it all backs off together
+        self.breaker = CircuitBreaker(
+            BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIME, BREAKER_MAX_RECOVERY_TIME
+        )
+        # True while entities show the last known state of an unreachable hub
+        self.stale = False
+        self._boost_until = 0.0
+        # When the event stream last delivered an event for this hub
+        self.last_event_at = None
+        # Entity state writes skipped because nothing visible changed
+        self.suppressed_writes = 0
+
+    def restore(self, snapshot):
+        """Seed with cached state; shown as stale until the first live refresh."""
+        if not snapshot:
+            return
+        self.hub_info = snapshot.get("hub_info")
+        devices = snapshot.get("devices")
+        if devices is not None:
+            self.data = {
+                device_id: DeviceState.from_payload(device)
+                for device_id, device in devices.items()
+                if isinstance(device, dict) and device.get("id")
+            }
+        self.stale = True
+
+    def device_changed(self, device_id, fields=None):
+        """Whether the last refresh changed the device, or any of the given fields of it."""
+        if self.changed_fields is None:
+            return True
+        changed = self.changed_fields.get(device_id)
+        return bool(changed) and (fields is None or not changed.isdisjoint(fields))
+
+    @property
+    def push_active(self):
+        """Whether events for this hub arrived recently enough to trust push over polling."""
+        return self.last_event_at is not None and time.monotonic() - self.last_event_at < PUSH_TIMEOUT
+
+    @property
+    def is_armed(self):
+        state = (self.hub_info or {}).get("state")
+        return bool(state) and not state.startswith("DISARMED")
+
+
+    @callback
+    def async_handle_event(self, event):
+        """React to a pushed hub event by refreshing right away."""
+        self.last_event_at = time.monotonic()
+        if event.action not in STATEFUL_ACTIONS:
+            # Still proof that push works for this hub
+            self._apply_interval()
+            return
+        # Whatever is cached for the hub predates the event
+        self.api.invalidate_hub(self.hub_id)
+        self.start_boost()
+
+    @callback
+    def start_boost(self):
+        """Boost without waiting for the refresh it triggers."""
+        self.config_entry.async_create_background_task(
+            self.hass, self.async_boost(), f"{DOMAIN}_boost_{self.hub_id}"
+        )
+
+    async def async_boost(self):
+        """Poll fast for a while, e.g. right after an arming command."""
+        self._boost_until = time.monotonic() + COMMAND_BOOST_DURATION
+        self._apply_interval()
+        await self.async_request_refresh()
+
+    async def async_wait_for_hub_state(self, predicate, timeout):
+        """Poll hub info with growing gaps until predicate(state) holds or timeout passes."""
+        deadline = time.monotonic() + timeout
+        delay = CONFIRM_INITIAL_DELAY
+        while True:
+            await asyncio.sleep(min(delay, max(0, deadline - time.monotonic())))
+            try:
+                hub_info = await self.api.get_hub_info(self.hub_id, priority=PRIORITY_COMMAND, fresh=True)
+            except TRANSIENT_ERRORS as err:
+                _LOGGER.debug("Hub %s state check failed: %s", self.hub_id, err)
+                hub_info = None
+            if hub_info is not None:
+                self.hub_changed = hub_info != self.hub_info
+                self.hub_info = hub_info
+                # Only the hub moved; device entities have nothing to write
+                self.changed_fields = {}
+                self.async_update_listeners()
+                if predicate(hub_info.get("state")):
+                    return True
+            if time.monotonic() >= deadline:
+                return False
+            delay = min(delay * 2, CONFIRM_MAX_DELAY)
+
+    def _apply_interval(self, devices=None):
+        devices = (self.data or {}) if devices is None else devices
+        if self.breaker.is_open:
+            interval = max(DEFAULT_SCAN_INTERVAL, timedelta(seconds=self.breaker.retry_in))
+        elif time.monotonic() < self._boost_until or _alarm_active(devices):
+            interval = FAST_SCAN_INTERVAL
+        elif self.push_active:
+            # Alarms and arming arrive by push; polling only tracks telemetry
+            interval = IDLE_SCAN_INTERVAL
+        elif self.is_armed:
+            interval = ARMED_SCAN_INTERVAL
+        elif self.hub_info is not None and not _has_always_armed_devices(devices):
+            interval = IDLE_SCAN_INTERVAL
+        else:
+            interval = DEFAULT_SCAN_INTERVAL
+        if interval != self.update_interval:
+            _LOGGER.debug("Hub %s polling interval now %s", self.hub_id, interval)
+            self.update_interval = interval
+
+    async def _async_update_data(self):
+        request_owner.set(self.config_entry.entry_id)
+        recovering = not self.last_update_success or self.stale
+        self.changed_fields = None
+        self.hub_changed = True
+
+        try:
+            hub_info, devices = await asyncio.gather(
+                self.api.get_hub_info(self.hub_id),
+                self.api.get_hub_devices(self.hub_id, enrich=True),
+            )
+        except TRANSIENT_ERRORS as err:
+            self.breaker.record_failure()
+            self._apply_interval()
+            if self.data is None:
+                raise UpdateFailed(f"Error fetching hub {self.hub_id}: {err}") from err
+            _LOGGER.warning(
+                "Hub %s unreachable, keeping last known state (next try in %s): %s",
+                self.hub_id, self.update_interval, err,
+            )
+            self.stale = True
+            return self.data
+
+        self.breaker.record_success()
+        self.stale = False
+
+        if devices is None:
+            devices = []
+        if not isinstance(devices, list):
+            raise UpdateFailed(f"Unexpected devices payload for hub {self.hub_id}: {type(devices)}")
+
+        previous = self.data or {}
+        data = {}
+        changed_fields = {}
+        for device in devices:
+            if not isinstance(device, dict) or not device.get("id"):
+                continue
+            device_id = device["id"]
+            state = previous.get(device_id)
+            if state is None:
+                data[device_id] = DeviceState.from_payload(device)
+                changed_fields[device_id] = ALL_FIELDS
+                continue
+            data[device_id] = state
+            fields = state.update(device)
+            if fields:
+                changed_fields[device_id] = fields
+        self.device_ids = list(data)
+
+        if self.data is not None and not recovering:
+            self.hub_changed = hub_info != self.hub_info
+            self.changed_fields = changed_fields
+            _LOGGER.debug(
+                "Hub %s: %d of %d devices changed",
+                self.hub_id, len(changed_fields), len(data),
+            )
+        self.hub_info = hub_info
+        self._apply_interval(data)
+        return data
@@ -0,0 +1,106 @@
+import json
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Device fields any part of the integration reads; everything else is dropped on decode
+DEVICE_FIELDS = frozenset({
+    "id",
+    "deviceName",
+    "deviceType",
+    "online",
+    "state",
+    "temperature",
+    "batteryChargeLevelPercentage",
+    "reedClosed",
+    "extraContactClosed",
+    "smokeAlarmDetected",
+    "coAlarmDetected",
+    "temperatureAlarmDetected",
+    "highTemperatureDiffDetected",
+    "leakDetected",
+    "humidity",
+    "co2",
+    "firmwareVersion",
+    "signalLevel",
+})
+
+_CONTAINER_START = ("start_map", "start_array")
+_CONTAINER_END = ("end_map", "end_array")
+
+
+def slim_device(device):
+    if not isinstance(device, dict):
+        return device
+    return {key: value for key, value in device.items() if key in DEVICE_FIELDS}
+
+
+def loads(body):
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+async def read_json(resp):
+    """Decode a response body, with orjson when it is installed."""
+    return loads(await resp.read())
+
+
+async def iter_devices(resp):
+    """
+    Yield the devices of a JSON array response one at a time, trimmed to DEVICE_FIELDS.
+
+    With ijson installed the body is parsed incrementally, so only one device is
+    materialised at a time. Raises ValueError if the body is not an array or not JSON at all.
+    """
+    if ijson is None:
+        data = await read_json(resp)
+        if not isinstance(data, list):
+            raise ValueError(f"Expected a device list, got: {data}")
+        for device in data:
+            yield slim_device(device)
+        return
+
+    try:
+        async for device in _parse_device_array(resp.content):
+            yield device
+    except ijson.JSONError as err:
+        # Empty, truncated or HTML bodies; callers only expect ValueError, as from the json path
+        raise ValueError(f"Malformed device list: {err}") from err
+
+
+async def _parse_device_array(stream):
+    top = None
+    builder = None
+    depth = 0
+    async for _prefix, event, value in ijson.parse(stream, use_float=True):
+        if top is None:
+            top = event
+            if event != "start_array":
+                # Not a list (usually an error body): build it whole for the message
+                builder = ObjectBuilder()
+                builder.event(event, value)
+            continue
+        if top != "start_array":
+            builder.event(event, value)
+            continue
+        if depth == 0:
+            if event == "end_array":
+                return
+            builder = ObjectBuilder()
+        builder.event(event, value)
+        if event in _CONTAINER_START:
+            depth += 1
+        elif event in _CONTAINER_END:
+            depth -= 1
+        if depth == 0:
+            yield slim_device(builder.value)
+
+    if top != "start_array":
+        raise ValueError(f"Expected a device list, got: {builder.value if builder else None}")
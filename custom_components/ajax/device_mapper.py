@@ -1,73 +1,101 @@
-def map_ajax_device(device: dict) -> list[tuple[str, dict]]:
+import functools
+from types import MappingProxyType
+
+
+def _meta(**kwargs):
+    return MappingProxyType(kwargs)
+
+
+# Descriptors are immutable and shared by every device of the same type
+_MOTION = (
+    ("binary_sensor", _meta(device_class="motion")),
+    ("sensor", _meta(device_class="motion_temperature", unit="°C")),
+)
+_DOOR = (
+    ("binary_sensor", _meta(device_class="opening")),
+    ("sensor", _meta(device_class="door_temperature", unit="°C")),
+)
+_GLASS = (("binary_sensor", _meta(device_class="sound")),)
+_COMBI = (
+    ("binary_sensor", _meta(device_class="motion")),
+    ("binary_sensor", _meta(device_class="sound")),
+)
+_FIRE = (
+    ("binary_sensor", _meta(device_class="smoke")),
+    ("sensor", _meta(device_class="temperature", unit="°C")),
+    # ("sensor", _meta(device_class="carbon_monoxide", unit="ppm")),
+)
+_LEAK = (("binary_sensor", _meta(device_class="moisture")),)
+_SIREN = (("binary_sensor", _meta()),)
+_BUTTON = (("button", _meta(device_class="restart")),)
+_DOUBLE_BUTTON = (("button", _meta(device_class="update")),)
+_REMOTE = (("event", _meta(event_type="ajax_remote")),)
+_KEYPAD = (("event", _meta(event_type="ajax_keypad")),)
+_RELAY = (
+    ("switch", _meta()),
+    ("sensor", _meta(device_class="power", unit="W")),
+    ("sensor", _meta(device_class="energy", unit="kWh")),
+)
+_POWER_SUPPLY = (("sensor", _meta(device_class="voltage", unit="V")),)
+_REX = (("binary_sensor", _meta(device_class="connectivity")),)
+_LIFE_QUALITY = (
+    ("sensor", _meta(device_class="temperature", unit="°C")),
+    ("sensor", _meta(device_class="humidity", unit="%")),
+    ("sensor", _meta(device_class="carbon_dioxide", unit="ppm")),
+)
+_TRANSMITTER = (("binary_sensor", _meta(device_class="generic")),)
+_HUB = (("alarm_control_panel", _meta()),)
+
+# Lower-cased Ajax deviceType -> platform descriptors
+DEVICE_TYPE_REGISTRY = MappingProxyType({
+    **dict.fromkeys(
+        ("motionprotect", "motionprotectplus", "motionprotectoutdoor", "motionprotectcurtain"), _MOTION
+    ),
+    **dict.fromkeys(("doorprotect", "doorprotectplus"), _DOOR),
+    "glassprotect": _GLASS,
+    "combiprotect": _COMBI,
+    **dict.fromkeys(("fireprotect", "fireprotectplus"), _FIRE),
+    "leaksprotect": _LEAK,
+    **dict.fromkeys(("homesiren", "streetsiren"), _SIREN),
+    **dict.fromkeys(("lifelinebutton", "button"), _BUTTON),
+    "doublebutton": _DOUBLE_BUTTON,
+    "spacecontrol": _REMOTE,
+    **dict.fromkeys(("keypad", "keypadplus"), _KEYPAD),
+    **dict.fromkeys(("wallswitch", "socket", "relay"), _RELAY),
+    "powersupply": _POWER_SUPPLY,
+    **dict.fromkeys(("rex", "rex2"), _REX),
+    "lifequality": _LIFE_QUALITY,
+    **dict.fromkeys(("transmitter", "multitransmitter"), _TRANSMITTER),
+    **dict.fromkeys(("hub", "ajaxhub"), _HUB),
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _descriptors_for_type(device_type: str) -> tuple:
+    # Cached per raw type string, so lower() runs once per distinct type
+    return DEVICE_TYPE_REGISTRY.get(device_type.lower(), ())
+
+
+def map_ajax_device(device: dict) -> tuple[tuple[str, MappingProxyType], ...]:
     """
     Maps an Ajax device to Home Assistant platforms.
-    
+
     Returns:
-        List of tuples: (platform, {device_class, unit, ...})
+        Shared tuple of (platform, {device_class, unit, ...}) pairs; do not mutate
     """
-    device_type = device.get("deviceType", "").lower()
-    result = []
-
-    if device_type in [
-        "motionprotect", "motionprotectplus", "motionprotectoutdoor", "motionprotectcurtain"
-    ]:
-        result.append(("binary_sensor", {"device_class": "motion"}))
-        result.append(("sensor", {"device_class": "motion_temperature", "unit": "°C"}))
-
-    elif device_type in ["doorprotect", "doorprotectplus"]:
-        result.append(("binary_sensor", {"device_class": "opening"}))
-        result.append(("sensor", {"device_class": "door_temperature", "unit": "°C"}))
-
-    elif device_type == "glassprotect":
-        result.append(("binary_sensor", {"device_class": "sound"}))
-
-    elif device_type == "combiprotect":
-        result.append(("binary_sensor", {"device_class": "motion"}))
-        result.append(("binary_sensor", {"device_class": "sound"}))
-
-    elif device_type in ["fireprotect", "fireprotectplus"]:
-        result.append(("binary_sensor", {"device_class": "smoke"}))
-        result.append(("sensor", {"device_class": "temperature", "unit": "°C"}))
-        #result.append(("sensor", {"device_class": "carbon_monoxide", "unit": "ppm"}))
-
-    elif device_type == "leaksprotect":
-        result.append(("binary_sensor", {"device_class": "moisture"}))
-
-    elif device_type in ["homesiren", "streetsiren"]:
-        result.append(("binary_sensor", {}))
-
-    elif device_type in ["lifelinebutton", "button"]:
-        result.append(("button", {"device_class": "restart"}))
-
-    elif device_type == "doublebutton":
-        result.append(("button", {"device_class": "update"}))
+    return _descriptors_for_type(device.get("deviceType") or "")
 
-    elif device_type == "spacecontrol":
-        result.append(("event", {"event_type": "ajax_remote"}))
 
-    elif device_type in ["keypad", "keypadplus"]:
-        result.append(("event", {"event_type": "ajax_keypad"}))
-
-    elif device_type in ["wallswitch", "socket", "relay"]:
-        result.append(("switch", {}))
-        result.append(("sensor", {"device_class": "power", "unit": "W"}))
-        result.append(("sensor", {"device_class": "energy", "unit": "kWh"}))
-
-    elif device_type == "powersupply":
-        result.append(("sensor", {"device_class": "voltage", "unit": "V"}))
-
-    elif device_type in ["rex", "rex2"]:
-        result.append(("binary_sensor", {"device_class": "connectivity"}))
-
-    elif device_type == "lifequality":
-        result.append(("sensor", {"device_class": "temperature", "unit": "°C"}))
-        result.append(("sensor", {"device_class": "humidity", "unit": "%"}))
-        result.append(("sensor", {"device_class": "carbon_dioxide", "unit": "ppm"}))
-
-    elif device_type in ["transmitter", "multitransmitter"]:
-        result.append(("binary_sensor", {"device_class": "generic"}))
-
-    elif device_type in ["hub", "ajaxhub"]:
-        result.append(("alarm_control_panel", {}))
+def build_platform_index(devices_by_hub: dict) -> dict[str, list[tuple]]:
+    """
+    Groups every device of every hub by target platform in a single pass.
 
-    return result
+    Returns:
+        {platform: [(hub_id, device, meta), ...]}
+    """
+    index = {}
+    for hub_id, devices in devices_by_hub.items():
+        for device in devices:
+            for platform, meta in map_ajax_device(device):
+                index.setdefault(platform, []).append((hub_id, device, meta))
+    return index
@@ -0,0 +1,65 @@
+# DeviceState attribute -> Ajax payload key
+_FIELD_KEYS = (
+    ("name", "deviceName"),
+    ("device_type", "deviceType"),
+    ("online", "online"),
+    ("state", "state"),
+    ("temperature", "temperature"),
+    ("battery", "batteryChargeLevelPercentage"),
+    ("reed_closed", "reedClosed"),
+    ("extra_contact_closed", "extraContactClosed"),
+    ("smoke_alarm", "smokeAlarmDetected"),
+    ("co_alarm", "coAlarmDetected"),
+    ("temperature_alarm", "temperatureAlarmDetected"),
+    ("temperature_rise_alarm", "highTemperatureDiffDetected"),
+    ("leak_detected", "leakDetected"),
+    ("humidity", "humidity"),
+    ("co2", "co2"),
+    ("firmware", "firmwareVersion"),
+    ("signal", "signalLevel"),
+)
+
+ALL_FIELDS = frozenset(field for field, _ in _FIELD_KEYS)
+
+# Flags that mean something is happening right now
+ALARM_FIELDS = ("smoke_alarm", "co_alarm", "temperature_alarm", "temperature_rise_alarm", "leak_detected")
+
+
+class DeviceState:
+    """Parsed state of one Ajax device, shared by reference by all of its entities."""
+
+    __slots__ = ("device_id", *(field for field, _ in _FIELD_KEYS))
+
+    def __init__(self, device_id):
+        self.device_id = device_id
+        for field, _ in _FIELD_KEYS:
+            setattr(self, field, None)
+
+    @classmethod
+    def from_payload(cls, payload):
+        state = cls(payload["id"])
+        state.update(payload)
+        return state
+
+    def update(self, payload):
+        """Apply a fresh API payload in place; returns the names of the fields that changed."""
+        changed = set()
+        for field, key in _FIELD_KEYS:
+            value = payload.get(key)
+            if getattr(self, field) != value:
+                setattr(self, field, value)
+                changed.add(field)
+        return frozenset(changed)
+
+    def as_dict(self):
+        """Payload shaped dict, for the inventory cache."""
+        payload = {"id": self.device_id}
+        for field, key in _FIELD_KEYS:
+            value = getattr(self, field)
+            if value is not None:
+                payload[key] = value
+        return payload
+
+    @property
+    def alarm_active(self):
+        return any(getattr(self, field) for field in ALARM_FIELDS)
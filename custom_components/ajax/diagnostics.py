@@ -0,0 +1,46 @@
+import time
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import DOMAIN
+
+TO_REDACT = {"session_token", "refresh_token", "api_key", "user_id", "password", "login", "webhook_id"}
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    entry_data = hass.data[DOMAIN].get(entry.entry_id, {})
+    api = entry_data.get("api")
+    coordinators = entry_data.get("coordinators", {})
+    event_stream = entry_data.get("event_stream")
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": dict(entry.options),
+        "setup_timing": {
+            stage: round(seconds, 3)
+            for stage, seconds in entry_data.get("setup_timing", {}).items()
+            if stage != "started"
+        },
+        "api": None if api is None else {
+            **api.metrics.as_dict(),
+            "in_flight": api.scheduler.in_flight,
+            "queued": api.scheduler.queued,
+            "cache": api.cache.as_dict(),
+            "entries_sharing_client": len(api.entries),
+            "session_token_age": round(time.time() - api.session_created_at),
+        },
+        "hubs": {
+            hub_id: {
+                "devices": len(coordinator.device_ids),
+                "update_interval": str(coordinator.update_interval),
+                "last_update_success": coordinator.last_update_success,
+                "stale": coordinator.stale,
+                "breaker_open": coordinator.breaker.is_open,
+                "breaker_failures": coordinator.breaker.failures,
+                "push_active": coordinator.push_active,
+                "suppressed_writes": coordinator.suppressed_writes,
+            }
+            for hub_id, coordinator in coordinators.items()
+        },
+        "event_stream": None if event_stream is None else {"events_received": event_stream.events_received},
+    }
@@ -0,0 +1,72 @@
+import logging
+import time
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AjaxCoordinatorEntity(CoordinatorEntity):
+    """Coordinator entity that skips coordinator updates which would not change its state.
+
+    Only writes made through _async_write_if_changed are filtered. Writes HA makes on its
+    own, e.g. after an entity registry update, go through async_write_ha_state untouched.
+    """
+
+    # What the last filtered write recorded: (available, state, attributes, name)
+    _last_written = None
+    # Device whose DeviceState the entity shows; None for hub level entities
+    _device_id = None
+    # DeviceState fields shown by the entity; changes to any other field skip the state write
+    _state_fields = frozenset()
+
+    @property
+    def _device_state(self):
+        # Shared with every other entity of the device, parsed once per refresh
+        return (self.coordinator.data or {}).get(self._device_id)
+
+    def _update_name(self):
+        # Keep up with devices renamed in the Ajax app
+        state = self._device_state
+        if state is not None and state.name:
+            self._attr_name = f"{state.name} ({self._device_id})"
+
+    @callback
+    def _handle_coordinator_update(self):
+        if self._device_id is not None:
+            if not self.coordinator.device_changed(self._device_id, self._state_fields):
+                return
+            self._update_name()
+        self._async_write_if_changed()
+
+    def _written_state(self):
+        return (self.available, self.state, self.extra_state_attributes, self.name)
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self._last_written = None
+
+    @callback
+    def _async_write_if_changed(self):
+        """Write the state unless it matches the last one written through here."""
+        written = self._written_state()
+        if written == self._last_written:
+            # Counted per hub so the effect shows up on its diagnostic sensor
+            self.coordinator.suppressed_writes += 1
+            return
+        self._last_written = written
+        self.async_write_ha_state()
+        if written[0] and written[1] not in (None, STATE_UNKNOWN, STATE_UNAVAILABLE):
+            self._note_first_usable()
+
+    def _note_first_usable(self):
+        entry_data = self.hass.data[DOMAIN].get(self.coordinator.config_entry.entry_id, {})
+        timing = entry_data.get("setup_timing")
+        if timing is None or "first_entity" in timing:
+            return
+        timing["first_entity"] = time.monotonic() - timing["started"]
+        _LOGGER.info("First usable Ajax entity %s after %.2fs", self.entity_id, timing["first_entity"])
@@ -1,24 +1,26 @@
+import functools
+
 from homeassistant.components.event import EventEntity
-from .const import DOMAIN
-from .device_mapper import map_ajax_device
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from .event_stream import EVENT_ACTIONS, signal_device_event
+from .inventory import async_setup_platform_items
 
 async def async_setup_entry(hass, entry, async_add_entities):
-    devices_by_hub = hass.data[DOMAIN][entry.entry_id]["devices_by_hub"]
-    entities = []
+    async_setup_platform_items(
+        hass, entry, "event", async_add_entities, functools.partial(_build_entities, entry.entry_id)
+    )
 
-    for hub_id, devices in devices_by_hub.items():
-        for device in devices:
-            for platform, meta in map_ajax_device(device):
-                if platform != "event":
-                    continue
-                entity = AjaxEvent(device, meta, hub_id)
-                entities.append(entity)
 
-    async_add_entities(entities)
+def _build_entities(entry_id, items):
+    return [AjaxEvent(entry_id, device, meta, hub_id) for hub_id, device, meta in items]
 
 
 class AjaxEvent(EventEntity):
-    def __init__(self, device, meta, hub_id):
+    _attr_event_types = list(EVENT_ACTIONS)
+
+    def __init__(self, entry_id, device, meta, hub_id):
+        self._entry_id = entry_id
         self._device = device
         self._meta = meta 
         self.hub_id = hub_id
@@ -26,11 +28,20 @@ class AjaxEvent(EventEntity):
         self._attr_unique_id = f"ajax_{device.get('id')}_{meta.get('device_class')}"
         self._attr_device_class = meta.get("device_class")
 
-    @property
-    def native_value(self):
-        # Возвращаем последнее событие из устройства,
-        # например, поле 'last_event' или 'event_description' — подставь своё
-        return self._device.get("last_event", "No events")
-    @property
-    def event_types(self):
-        return [self._meta.get("event_type", "ajax_event")]
\ No newline at end of file
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, signal_device_event(self._entry_id, self._device.get("id")), self._async_handle_event
+            )
+        )
+
+    @callback
+    def _async_handle_event(self, event):
+        self._trigger_event(event.action, {
+            "tag": event.tag,
+            "hub_id": event.hub_id,
+            "source_name": event.source_name,
+            "timestamp": event.timestamp,
+        })
+        self.async_write_ha_state()
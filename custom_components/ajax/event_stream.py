@@ -0,0 +1,158 @@
+import logging
+from dataclasses import dataclass
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Actions exposed as EventEntity event types
+EVENT_ACTIONS = ("arm", "disarm", "night_mode", "panic", "alarm", "other")
+
+# Lower-cased Ajax event tags -> action
+_TAG_ACTIONS = {
+    "arm": "arm",
+    "grouparm": "arm",
+    "armwithmalfunctions": "arm",
+    "disarm": "disarm",
+    "groupdisarm": "disarm",
+    "nightmodeon": "night_mode",
+    "nightmodeoff": "disarm",
+    "panic": "panic",
+    "panicbutton": "panic",
+}
+# Actions that change hub or device state and warrant an immediate refresh
+STATEFUL_ACTIONS = frozenset({"arm", "disarm", "night_mode", "panic", "alarm"})
+
+
+def signal_device_event(entry_id, device_id):
+    return f"{DOMAIN}_{entry_id}_event_{device_id}"
+
+
+@dataclass(frozen=True)
+class HubEvent:
+    hub_id: str
+    device_id: str | None
+    action: str
+    tag: str
+    source_name: str | None = None
+    timestamp: int | None = None
+
+
+def decode_event(payload):
+    """Decode one Ajax event notification; returns None for anything that isn't an event."""
+    if not isinstance(payload, dict):
+        return None
+    event = payload.get("event", payload)
+    if not isinstance(event, dict):
+        return None
+    hub_id = event.get("hubId")
+    tag = event.get("eventTag") or event.get("eventType")
+    if not hub_id or not tag:
+        return None
+
+    key = tag.replace("_", "").lower()
+    action = _TAG_ACTIONS.get(key)
+    if action is None:
+        action = "alarm" if key.endswith(("alarm", "detected", "opened")) else "other"
+    return HubEvent(
+        hub_id=hub_id,
+        device_id=event.get("sourceObjectId"),
+        action=action,
+        tag=tag,
+        source_name=event.get("sourceObjectName"),
+        timestamp=event.get("timestamp"),
+    )
+
+
+class EventTransport:
+    """Delivers raw event payloads to the stream; subclasses decide where they come from."""
+
+    def __init__(self):
+        self._handler = None
+
+    async def async_start(self, handler):
+        self._handler = handler
+
+    async def async_stop(self):
+        self._handler = None
+
+    @callback
+    def deliver(self, payload):
+        if self._handler is not None:
+            self._handler(payload)
+
+
+class LocalEventTransport(EventTransport):
+    """In-process stand-in for tests and benchmarks."""
+
+    async def async_publish(self, payload):
+        self.deliver(payload)
+
+
+class WebhookEventTransport(EventTransport):
+    """Receives events pushed by the Ajax cloud to a Home Assistant webhook."""
+
+    def __init__(self, hass, webhook_id):
+        super().__init__()
+        self.hass = hass
+        self.webhook_id = webhook_id
+
+    async def async_start(self, handler):
+        await super().async_start(handler)
+        webhook.async_register(
+            self.hass, DOMAIN, "Ajax events", self.webhook_id, self._async_handle_webhook,
+            allowed_methods=["POST"],
+        )
+        _LOGGER.info("Ajax events webhook: %s", webhook.async_generate_path(self.webhook_id))
+
+    async def async_stop(self):
+        webhook.async_unregister(self.hass, self.webhook_id)
+        await super().async_stop()
+
+    async def _async_handle_webhook(self, hass, webhook_id, request):
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+        for item in payload if isinstance(payload, list) else [payload]:
+            self.deliver(item)
+        return None
+
+
+class AjaxEventStream:
+    """Decodes pushed hub events and fans them out to coordinators and event entities."""
+
+    def __init__(self, hass, entry_id, transport):
+        self.hass = hass
+        self.entry_id = entry_id
+        self.transport = transport
+        self.events_received = 0
+
+    @property
+    def coordinators(self):
+        return self.hass.data[DOMAIN][self.entry_id]["coordinators"]
+
+    async def async_start(self):
+        await self.transport.async_start(self._async_handle_payload)
+
+    async def async_stop(self):
+        await self.transport.async_stop()
+
+    @callback
+    def _async_handle_payload(self, payload):
+        event = decode_event(payload)
+        if event is None:
+            _LOGGER.debug("Ignoring undecodable Ajax event: %s", payload)
+            return
+        self.events_received += 1
+
+        coordinator = self.coordinators.get(event.hub_id)
+        if coordinator is not None:
+            coordinator.async_handle_event(event)
+        if event.device_id:
+            async_dispatcher_send(self.hass, signal_device_event(self.entry_id, event.device_id), event)
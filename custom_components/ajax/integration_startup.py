@@ -1,56 +1,250 @@
+import asyncio
+import functools
 import logging
-from aiohttp import ClientSession, ClientTimeout
-from .const import DOMAIN
-from .device_mapper import map_ajax_device
-from .api import AjaxAPI
+import time
+from .const import (
+    DOMAIN,
+    CONF_DISCOVERY_CONCURRENCY,
+    DEFAULT_DISCOVERY_CONCURRENCY,
+    INVENTORY_SCAN_INTERVAL,
+    CONF_EVENT_TRANSPORT,
+    EVENT_TRANSPORT_NONE,
+    EVENT_TRANSPORT_WEBHOOK,
+)
+from homeassistant.components import webhook
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_time_interval
+from .device_mapper import build_platform_index
+from .client_registry import async_acquire_client
+from .coordinator import AjaxHubCoordinator, TRANSIENT_ERRORS
+from .event_stream import AjaxEventStream, WebhookEventTransport
+from .inventory import InventoryStore, async_apply_inventory, async_track_state_saves, inventory_fingerprint
+from .scheduler import request_owner
 _LOGGER = logging.getLogger(__name__)
 
-async def do_setup(hass, entry):
-    _LOGGER.error(f"INIT HASS: {hass!r} ({bool(hass)}) ENTRY: {entry!r} ({bool(entry)})")
-    session = ClientSession(timeout=ClientTimeout(total=10))
-    api = AjaxAPI(entry.data, hass, entry, session)
-    hass.data[DOMAIN][entry.entry_id]["api"] = api
-    hass.data[DOMAIN][entry.entry_id]["session"] = session
+async def discover_hub_devices(api, hubs, concurrency, on_hub=None):
+    """
+    Fetch device lists for all hubs concurrently, isolating per-hub failures.
+
+    on_hub(hub_id, devices), if given, is awaited as soon as each hub's devices arrive.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
+    async def fetch(hub_id):
+        async with semaphore:
+            _LOGGER.debug("Fetching devices for hub: %s", hub_id)
+            devices = await api.get_hub_devices(hub_id)
+        if on_hub is not None:
+            await on_hub(hub_id, devices or [])
+        return devices
+
+    hub_ids = [hub["hubId"] for hub in hubs]
+    results = await asyncio.gather(*(fetch(hub_id) for hub_id in hub_ids), return_exceptions=True)
+
+    devices_by_hub = {}
+    failed_hub_ids = set()
+    for hub_id, result in zip(hub_ids, results):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, Exception):
+            _LOGGER.warning("Device discovery failed for hub %s: %s", hub_id, result)
+            failed_hub_ids.add(hub_id)
+            result = []
+        devices_by_hub[hub_id] = result or []
+    return devices_by_hub, failed_hub_ids
 
-    # Only refresh token if session token is expired or close to expiring
-    if api.is_token_expired():
-        await api.update_refresh_token()
-       
-   
-    # Get list of hubs
+
+async def fetch_hubs(api):
     hubs = await api.get_hubs()
     if not hubs or not isinstance(hubs, list):
         _LOGGER.error("No hubs returned from API or invalid format. Got: %s", type(hubs))
-        return False
-    hass.data[DOMAIN][entry.entry_id]["hubs"] = hubs
-    _LOGGER.error("Received %d hubs", len(hubs))
+        return None
+    _LOGGER.info("Received %d hubs", len(hubs))
+    return hubs
 
-    # Get devices per hub
-    devices_by_hub = {}
-    all_devices = []
 
-    for hub in hubs:
-        hub_id = hub["hubId"]
-        _LOGGER.warning("Fetching devices for hub: %s", hub_id)
-        devices = await api.get_hub_devices(hub_id)
-        devices_by_hub[hub_id] = devices
-        all_devices.extend(devices)
+async def fetch_inventory(api, entry):
+    """Fetch hubs and their devices from the cloud; returns (hubs, devices_by_hub, failed_hub_ids)."""
+    hubs = await fetch_hubs(api)
+    if hubs is None:
+        return None, None, None
+
+    # Get devices per hub, fanning out across hubs
+    devices_by_hub, failed_hub_ids = await discover_hub_devices(api, hubs, entry.options.get(
+        CONF_DISCOVERY_CONCURRENCY, DEFAULT_DISCOVERY_CONCURRENCY
+    ))
+    return hubs, devices_by_hub, failed_hub_ids
+
+
+async def async_refresh_inventory(hass, entry):
+    """Fetch the live inventory and apply only what changed."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    request_owner.set(entry.entry_id)
+    # Periodic runs and the warm start must not reconcile at the same time
+    async with entry_data.setdefault("inventory_lock", asyncio.Lock()):
+        hubs, devices_by_hub, failed_hub_ids = await fetch_inventory(entry_data["api"], entry)
+        if hubs is None:
+            return False
+        # A hub we couldn't read keeps its known devices rather than losing them all
+        for hub_id in failed_hub_ids:
+            devices_by_hub[hub_id] = entry_data["devices_by_hub"].get(hub_id, [])
+
+        known = entry_data.get("inventory_hashes") or {
+            hub_id: inventory_fingerprint(devices)
+            for hub_id, devices in entry_data["devices_by_hub"].items()
+        }
+        hashes = {hub_id: inventory_fingerprint(devices) for hub_id, devices in devices_by_hub.items()}
+        entry_data["inventory_hashes"] = hashes
+        if hashes == known:
+            _LOGGER.debug("Ajax inventory unchanged for %d hubs", len(hashes))
+            return False
+
+        changed = await async_apply_inventory(hass, entry, hubs, devices_by_hub)
+        await entry_data["inventory_store"].async_save(entry_data)
+        return changed
+
+
+async def _async_periodic_inventory(hass, entry, _now=None):
+    try:
+        await async_refresh_inventory(hass, entry)
+    except Exception as err:
+        _LOGGER.warning("Ajax inventory check failed: %s", err)
+
+
+async def _async_warm_start(hass, entry):
+    """After starting from cache, bring state and inventory up to date in the background."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinators = entry_data["coordinators"]
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators.values()))
+    try:
+        await async_refresh_inventory(hass, entry)
+    except Exception as err:
+        _LOGGER.warning("Could not reconcile cached Ajax inventory: %s", err)
+    _async_mark_setup_complete(entry_data)
+
+
+async def _async_discover_in_stages(hass, entry):
+    """
+    Bring devices in hub by hub after a cold start.
+
+    The alarm panels are already up; each hub's device entities are added as soon as its
+    device list arrives, while the coordinators fetch the first states alongside.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    request_owner.set(entry.entry_id)
+    api = entry_data["api"]
+    lock = entry_data.setdefault("inventory_lock", asyncio.Lock())
+
+    async def add_hub_devices(hub_id, devices):
+        async with lock:
+            devices_by_hub = {**entry_data["devices_by_hub"], hub_id: devices}
+            await async_apply_inventory(hass, entry, entry_data["hubs"], devices_by_hub)
 
+    coordinators = entry_data["coordinators"].values()
+    _, (_, failed_hub_ids) = await asyncio.gather(
+        # async_refresh never raises, so one broken hub can't fail the others
+        asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators)),
+        discover_hub_devices(
+            api,
+            entry_data["hubs"],
+            entry.options.get(CONF_DISCOVERY_CONCURRENCY, DEFAULT_DISCOVERY_CONCURRENCY),
+            on_hub=add_hub_devices,
+        ),
+    )
+    if failed_hub_ids:
+        # The periodic inventory check picks these up later
+        _LOGGER.warning("Ajax devices of %d hubs not available yet", len(failed_hub_ids))
+    else:
+        entry_data["inventory_hashes"] = {
+            hub_id: inventory_fingerprint(devices) for hub_id, devices in entry_data["devices_by_hub"].items()
+        }
+    await entry_data["inventory_store"].async_save(entry_data)
+    _async_mark_setup_complete(entry_data)
+
+
+def _async_mark_setup_complete(entry_data):
+    timing = entry_data["setup_timing"]
+    timing["complete"] = time.monotonic() - timing["started"]
+    _LOGGER.info(
+        "Ajax setup finished: hubs after %.2fs, first usable entity after %ss, everything after %.2fs",
+        timing.get("hubs_known", 0),
+        round(timing["first_entity"], 2) if "first_entity" in timing else None,
+        timing["complete"],
+    )
+
+
+async def _async_start_event_stream(hass, entry):
+    webhook_id = entry.data.get("webhook_id")
+    if not webhook_id:
+        # Stable across restarts so the URL configured in Ajax keeps working
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(entry, data={**entry.data, "webhook_id": webhook_id})
+    stream = AjaxEventStream(hass, entry.entry_id, WebhookEventTransport(hass, webhook_id))
+    await stream.async_start()
+    hass.data[DOMAIN][entry.entry_id]["event_stream"] = stream
+
+
+async def do_setup(hass, entry):
+    _LOGGER.debug("Setting up Ajax entry %s", entry.entry_id)
+    # Requests made while setting up count against this entry's share of the account budget
+    request_owner.set(entry.entry_id)
+    # Entries of the same Ajax account share one client, session and token lifecycle
+    api = async_acquire_client(hass, entry)
+    hass.data[DOMAIN][entry.entry_id]["api"] = api
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    # Seconds since setup started at each stage; first_entity is filled in by the entities
+    entry_data["setup_timing"] = {"started": time.monotonic()}
+
+
+    store = InventoryStore(hass, entry.entry_id)
+    entry_data["inventory_store"] = store
+    cached = await store.async_load()
+
+    if cached:
+        # Warm start: the token refresher and the background reconcile talk to the cloud
+        hubs = cached["hubs"]
+        devices_by_hub = cached["devices_by_hub"]
+        _LOGGER.debug("Starting from cached inventory with %d hubs", len(hubs))
+    else:
+        try:
+            # Only refresh token if session token is expired or close to expiring
+            if api.is_token_expired():
+                await api.update_refresh_token()
+            hubs = await fetch_hubs(api)
+        except TRANSIENT_ERRORS as err:
+            raise ConfigEntryNotReady(f"Ajax cloud not reachable: {err}") from err
+        if hubs is None:
+            return False
+        # Devices follow hub by hub once the panels are up
+        devices_by_hub = {hub["hubId"]: [] for hub in hubs}
+    api.start_token_refresher()
+    entry_data["setup_timing"]["hubs_known"] = time.monotonic() - entry_data["setup_timing"]["started"]
+
+    entry_data["hubs"] = hubs
     # Store devices in memory
-    hass.data[DOMAIN][entry.entry_id]["devices_by_hub"] = devices_by_hub
+    entry_data["devices_by_hub"] = devices_by_hub
 
+    # One coordinator per hub polls all of its devices at once
+    coordinators = {
+        hub_id: AjaxHubCoordinator(hass, entry, api, hub_id, devices)
+        for hub_id, devices in devices_by_hub.items()
+    }
+    entry_data["coordinators"] = coordinators
+    if cached:
+        for hub_id, coordinator in coordinators.items():
+            coordinator.restore(cached.get("states", {}).get(hub_id))
 
+    # Group devices by platform once; every platform reads its slice from here
+    platform_index = build_platform_index(devices_by_hub)
+    entry_data["platform_index"] = platform_index
 
     # Determine required platforms based on device types
-    platforms = set()
-    for device in all_devices:
-        mappings = map_ajax_device(device)
-        for platform, _ in mappings:
-            platforms.add(platform)
+    platforms = set(platform_index)
 
     # Ensure alarm panel is always registered
     platforms.add("alarm_control_panel")
+    # Hub diagnostic sensors exist even without sensor devices
+    platforms.add("sensor")
     
 
     hass.config_entries.async_update_entry(
@@ -62,8 +256,26 @@ async def do_setup(hass, entry):
     )
     # Forward setup to all required platforms
     await hass.config_entries.async_forward_entry_setups(entry, list(platforms))
-    hass.data[DOMAIN][entry.entry_id]["loaded_platforms"] = list(platforms)
+    entry_data["loaded_platforms"] = list(platforms)
+
+    if entry.options.get(CONF_EVENT_TRANSPORT, EVENT_TRANSPORT_NONE) == EVENT_TRANSPORT_WEBHOOK:
+        await _async_start_event_stream(hass, entry)
+
+    for coordinator in coordinators.values():
+        async_track_state_saves(entry, entry_data, coordinator)
+
+    # Pick up added/removed devices without reloading the entry
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, functools.partial(_async_periodic_inventory, hass, entry), INVENTORY_SCAN_INTERVAL
+        )
+    )
+
+    if cached:
+        entry.async_create_background_task(hass, _async_warm_start(hass, entry), f"{DOMAIN}_warm_start")
+    else:
+        entry.async_create_background_task(
+            hass, _async_discover_in_stages(hass, entry), f"{DOMAIN}_staged_discovery"
+        )
     
     return True
-
-        
\ No newline at end of file
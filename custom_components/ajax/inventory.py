@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import json
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .coordinator import AjaxHubCoordinator
+from .device_mapper import build_platform_index
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Device state changes often; batch cache writes
+SAVE_DELAY = 60
+
+
+def signal_new_entities(entry_id, platform):
+    """Dispatcher signal carrying new items for an already loaded platform."""
+    return f"{DOMAIN}_{entry_id}_new_{platform}"
+
+
+@callback
+def async_setup_platform_items(hass, entry, platform, async_add_entities, build_entities):
+    """Add a platform's entities from the platform index; build_entities(items) builds them."""
+    data = hass.data[DOMAIN][entry.entry_id]
+
+    @callback
+    def async_add_items(items):
+        async_add_entities(build_entities(items))
+
+    async_add_items(data["platform_index"].get(platform, ()))
+    # Devices discovered later arrive without reloading the entry
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, signal_new_entities(entry.entry_id, platform), async_add_items)
+    )
+
+
+def snapshot_inventory(entry_data):
+    return {
+        "hubs": entry_data["hubs"],
+        "devices_by_hub": entry_data["devices_by_hub"],
+        "states": {
+            hub_id: {
+                "hub_info": coordinator.hub_info,
+                "devices": {
+                    device_id: state.as_dict() for device_id, state in (coordinator.data or {}).items()
+                },
+            }
+            for hub_id, coordinator in entry_data["coordinators"].items()
+        },
+    }
+
+
+class InventoryStore:
+    """Hub/device inventory and last known states persisted across restarts."""
+
+    def __init__(self, hass, entry_id):
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.inventory")
+        self._save_pending = False
+
+    async def async_load(self):
+        return await self._store.async_load()
+
+    async def async_save(self, entry_data):
+        # Also replaces any delayed save
+        self._save_pending = False
+        await self._store.async_save(snapshot_inventory(entry_data))
+
+    @callback
+    def async_schedule_save(self, entry_data):
+        """Save within SAVE_DELAY.
+
+        Store.async_delay_save restarts its delay on every call, and coordinators call this
+        on every refresh; rescheduling would postpone the write until shutdown.
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(lambda: self._snapshot(entry_data), SAVE_DELAY)
+
+    def _snapshot(self, entry_data):
+        self._save_pending = False
+        return snapshot_inventory(entry_data)
+
+    async def async_remove(self):
+        self._save_pending = False
+        await self._store.async_remove()
+
+
+@callback
+def async_track_state_saves(entry, entry_data, coordinator):
+    """Keep the cached states fresh as the coordinator polls."""
+    store = entry_data["inventory_store"]
+    entry.async_on_unload(coordinator.async_add_listener(lambda: store.async_schedule_save(entry_data)))
+
+
+def inventory_fingerprint(devices):
+    """Stable hash of one hub's device list, to skip diffing unchanged hubs."""
+    payload = json.dumps(devices, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _device_keys(devices_by_hub):
+    return {
+        (hub_id, device["id"])
+        for hub_id, devices in devices_by_hub.items()
+        for device in devices
+        if device.get("id")
+    }
+
+
+@callback
+def _async_remove_registry_entries(hass, entry, unique_id_matches, identifier_matches):
+    """Drop devices and entities from the registries; live entities follow automatically."""
+    device_registry = dr.async_get(hass)
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        if any(domain == DOMAIN and identifier_matches(ident) for domain, ident in device.identifiers):
+            device_registry.async_update_device(device.id, remove_config_entry_id=entry.entry_id)
+
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        if unique_id_matches(entity.unique_id):
+            entity_registry.async_remove(entity.entity_id)
+
+
+async def async_apply_inventory(hass, entry, hubs, devices_by_hub):
+    """Reconcile the live entities of an entry with a freshly fetched inventory."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    api = entry_data["api"]
+    coordinators = entry_data["coordinators"]
+
+    old_hub_ids = set(entry_data["devices_by_hub"])
+    new_hub_ids = set(devices_by_hub)
+    old_devices = _device_keys(entry_data["devices_by_hub"])
+    new_devices = _device_keys(devices_by_hub)
+
+    added_hub_ids = new_hub_ids - old_hub_ids
+    removed_hub_ids = old_hub_ids - new_hub_ids
+    added_devices = new_devices - old_devices
+    removed_device_ids = {device_id for _, device_id in old_devices - new_devices}
+
+    # Renames need no action here: entities pick names up from the coordinator payload
+    if not (added_hub_ids or removed_hub_ids or added_devices or removed_device_ids):
+        entry_data["hubs"] = hubs
+        entry_data["devices_by_hub"] = devices_by_hub
+        return False
+
+    _LOGGER.info(
+        "Ajax inventory changed: +%d/-%d hubs, +%d/-%d devices",
+        len(added_hub_ids), len(removed_hub_ids), len(added_devices), len(removed_device_ids),
+    )
+
+    new_coordinators = {
+        hub_id: AjaxHubCoordinator(hass, entry, api, hub_id, devices_by_hub[hub_id])
+        for hub_id in added_hub_ids
+    }
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in new_coordinators.values()))
+    coordinators.update(new_coordinators)
+    for coordinator in new_coordinators.values():
+        async_track_state_saves(entry, entry_data, coordinator)
+
+    platform_index = build_platform_index(devices_by_hub)
+    entry_data["hubs"] = hubs
+    entry_data["devices_by_hub"] = devices_by_hub
+    entry_data["platform_index"] = platform_index
+
+    if removed_device_ids:
+        _async_remove_registry_entries(
+            hass,
+            entry,
+            lambda unique_id: any(
+                unique_id == f"ajax_{device_id}" or unique_id.startswith(f"ajax_{device_id}_")
+                for device_id in removed_device_ids
+            ),
+            lambda ident: any(
+                ident == f"ajax_{device_id}" or ident.startswith(f"ajax_{device_id}_")
+                for device_id in removed_device_ids
+            ),
+        )
+    if removed_hub_ids:
+        _async_remove_registry_entries(
+            hass,
+            entry,
+            lambda unique_id: any(unique_id.startswith(f"ajax_{hub_id}_") for hub_id in removed_hub_ids),
+            lambda ident: ident in {f"ajax_hub_{hub_id}" for hub_id in removed_hub_ids},
+        )
+        for hub_id in removed_hub_ids:
+            await coordinators.pop(hub_id).async_shutdown()
+
+    loaded_platforms = entry_data.get("loaded_platforms", [])
+    required = set(platform_index) | {"alarm_control_panel", "sensor"}
+
+    # Already loaded platforms add only the new items
+    for platform in loaded_platforms:
+        if platform == "alarm_control_panel":
+            items = [hub for hub in hubs if hub["hubId"] in added_hub_ids]
+        else:
+            items = [item for item in platform_index.get(platform, ()) if (item[0], item[1]["id"]) in added_devices]
+        if items:
+            async_dispatcher_send(hass, signal_new_entities(entry.entry_id, platform), items)
+    if added_hub_ids and "sensor" in loaded_platforms:
+        # Hub diagnostics live on the sensor platform
+        async_dispatcher_send(hass, signal_new_entities(entry.entry_id, "hub_sensor"), list(added_hub_ids))
+
+    # Platforms not loaded yet set up from the full index
+    missing = [platform for platform in required if platform not in loaded_platforms]
+    if missing:
+        await hass.config_entries.async_forward_entry_setups(entry, missing)
+        entry_data["loaded_platforms"] = [*loaded_platforms, *missing]
+    return True
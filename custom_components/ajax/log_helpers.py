@@ -0,0 +1,30 @@
+import logging
+
+from .const import TIMING_LOG_SAMPLE, SLOW_REQUEST_THRESHOLD
+
+# Header values never written to the log
+SENSITIVE_HEADERS = frozenset({"x-session-token", "x-api-key", "authorization"})
+
+
+def redact_headers(headers):
+    return {
+        key: "**REDACTED**" if key.lower() in SENSITIVE_HEADERS else value
+        for key, value in (headers or {}).items()
+    }
+
+
+class TimingLogger:
+    """Samples request timings into a DEBUG log; costs one level check when DEBUG is off."""
+
+    def __init__(self, logger, sample_every=TIMING_LOG_SAMPLE, slow_threshold=SLOW_REQUEST_THRESHOLD):
+        self._logger = logger
+        self._sample_every = sample_every
+        self._slow_threshold = slow_threshold
+        self._count = 0
+
+    def log(self, elapsed, method, url, status):
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        self._count += 1
+        if elapsed >= self._slow_threshold or self._count % self._sample_every == 0:
+            self._logger.debug("%s %s -> %s in %.3fs (%d timed)", method, url, status, elapsed, self._count)
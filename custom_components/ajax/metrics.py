@@ -0,0 +1,150 @@
+import bisect
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are interpolated within a bucket."""
+
+    __slots__ = ("counts", "total", "sum", "max")
+
+    def __init__(self):
+        # One extra bucket for everything above the last bound
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        """Latency below which a q (0..1) share of requests completed, or None without data."""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.total,
+            "mean": self.sum / self.total if self.total else None,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip([*map(str, LATENCY_BUCKETS), "inf"], self.counts)),
+        }
+
+
+class EndpointStats:
+    __slots__ = ("requests", "errors", "retries", "coalesced", "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        # Calls answered by joining an identical request already in flight
+        self.coalesced = 0
+        self.latency = LatencyHistogram()
+
+
+class ApiMetrics:
+    """Request counters and latency histograms of one AjaxAPI, per endpoint."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.token_refreshes = 0
+        self.token_refresh_failures = 0
+        self.peak_in_flight = 0
+
+    def _endpoint(self, endpoint):
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record_request(self, endpoint, seconds, ok):
+        stats = self._endpoint(endpoint)
+        stats.requests += 1
+        stats.latency.observe(seconds)
+        if not ok:
+            stats.errors += 1
+
+    def record_retry(self, endpoint):
+        self._endpoint(endpoint).retries += 1
+
+    def record_coalesced(self, endpoint):
+        self._endpoint(endpoint).coalesced += 1
+
+    def record_in_flight(self, in_flight):
+        self.peak_in_flight = max(self.peak_in_flight, in_flight)
+
+    def record_token_refresh(self, ok):
+        if ok:
+            self.token_refreshes += 1
+        else:
+            self.token_refresh_failures += 1
+
+    @property
+    def requests(self):
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    @property
+    def errors(self):
+        return sum(stats.errors for stats in self.endpoints.values())
+
+    @property
+    def retries(self):
+        return sum(stats.retries for stats in self.endpoints.values())
+
+    @property
+    def coalesced(self):
+        return sum(stats.coalesced for stats in self.endpoints.values())
+
+    def latency(self):
+        """Histogram across all endpoints."""
+        combined = LatencyHistogram()
+        for stats in self.endpoints.values():
+            combined.merge(stats.latency)
+        return combined
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "token_refreshes": self.token_refreshes,
+            "token_refresh_failures": self.token_refresh_failures,
+            "peak_in_flight": self.peak_in_flight,
+            "latency": self.latency().as_dict(),
+            "endpoints": {
+                endpoint: {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "coalesced": stats.coalesced,
+                    "latency": stats.latency.as_dict(),
+                }
+                for endpoint, stats in self.endpoints.items()
+            },
+        }
@@ -0,0 +1,66 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value):
+    """Return the Retry-After header as seconds, or None if absent or malformed."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient failures."""
+
+    def __init__(self, max_attempts, base_delay, max_delay):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, retry_after=None):
+        """Return how long to wait before retry number attempt + 1, or None to give up."""
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Opens after repeated failures and backs off the retry window exponentially."""
+
+    def __init__(self, failure_threshold, recovery_time, max_recovery_time):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.max_recovery_time = max_recovery_time
+        self.failures = 0
+        self._opened_at = None
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    @property
+    def retry_in(self):
+        """Current recovery window in seconds; grows with every failure while open."""
+        extra = max(0, self.failures - self.failure_threshold)
+        return min(self.max_recovery_time, self.recovery_time * 2 ** extra)
+
+    def record_success(self):
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
@@ -0,0 +1,98 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+
+# Lower value wins
+PRIORITY_AUTH = 0
+PRIORITY_COMMAND = 1
+PRIORITY_POLL = 2
+
+# Who a request is made for, normally a config entry. Queued requests of equal priority
+# are granted to owners in turn, so one busy entry can't starve the others sharing a client.
+request_owner = contextvars.ContextVar("ajax_request_owner", default=None)
+
+
+class RequestScheduler:
+    """Token-bucket rate limit plus an in-flight cap, granted in priority order and fairly across owners."""
+
+    def __init__(self, rate, burst, max_in_flight):
+        self._rate = rate
+        self._capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._wakeup = None
+        # Start-time fair queuing: each owner's next turn, and the turn last granted
+        self._next_turn = {}
+        self._turn = 0
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    @property
+    def queued(self):
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority=PRIORITY_POLL):
+        if not self._waiters and self._try_take():
+            return
+        fut = asyncio.get_running_loop().create_future()
+        owner = request_owner.get()
+        turn = max(self._next_turn.get(owner, 0), self._turn)
+        self._next_turn[owner] = turn + 1
+        heapq.heappush(self._waiters, (priority, turn, next(self._seq), fut))
+        self._dispatch()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Granted just before we were cancelled: hand the slot back
+                self.release()
+            raise
+
+    def release(self):
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _try_take(self):
+        if self._in_flight >= self._max_in_flight:
+            return False
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._in_flight += 1
+        return True
+
+    def _dispatch(self):
+        while self._waiters:
+            _, turn, _, fut = self._waiters[0]
+            if fut.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiters)
+            self._turn = max(self._turn, turn)
+            fut.set_result(None)
+
+        if not self._waiters or self._in_flight >= self._max_in_flight or self._wakeup:
+            # Either idle or release() will dispatch again
+            return
+        delay = (1 - self._tokens) / self._rate
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._dispatch()
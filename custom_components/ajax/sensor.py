@@ -1,37 +1,107 @@
-from homeassistant.components.sensor import SensorEntity
+import functools
+from datetime import timedelta
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
-from .device_mapper import map_ajax_device
+from .entity import AjaxCoordinatorEntity
+from .inventory import async_setup_platform_items, signal_new_entities
 from .api import AjaxAPI
 import logging
 _LOGGER = logging.getLogger(__name__)
 
+# Only the API metric sensors poll; everything else follows its coordinator
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+# key, name, unit, state class, value from the AjaxAPI
+API_METRIC_SENSORS = (
+    ("requests", "API requests", None, SensorStateClass.TOTAL_INCREASING, lambda api: api.metrics.requests),
+    ("errors", "API errors", None, SensorStateClass.TOTAL_INCREASING, lambda api: api.metrics.errors),
+    ("retries", "API retries", None, SensorStateClass.TOTAL_INCREASING, lambda api: api.metrics.retries),
+    (
+        "coalesced", "API requests coalesced", None, SensorStateClass.TOTAL_INCREASING,
+        lambda api: api.metrics.coalesced,
+    ),
+    (
+        "token_refreshes", "API token refreshes", None, SensorStateClass.TOTAL_INCREASING,
+        lambda api: api.metrics.token_refreshes,
+    ),
+    ("in_flight", "API requests in flight", None, SensorStateClass.MEASUREMENT, lambda api: api.scheduler.in_flight),
+    (
+        "peak_in_flight", "API peak requests in flight", None, SensorStateClass.MEASUREMENT,
+        lambda api: api.metrics.peak_in_flight,
+    ),
+    (
+        "latency_p50", "API latency p50", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT,
+        lambda api: _ms(api.metrics.latency().percentile(0.5)),
+    ),
+    (
+        "latency_p95", "API latency p95", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT,
+        lambda api: _ms(api.metrics.latency().percentile(0.95)),
+    ),
+    (
+        "latency_p99", "API latency p99", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT,
+        lambda api: _ms(api.metrics.latency().percentile(0.99)),
+    ),
+)
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
-    devices_by_hub = hass.data[DOMAIN][entry.entry_id]["devices_by_hub"]
-    entities = []
     data = hass.data[DOMAIN][entry.entry_id]
-    api = hass.data[DOMAIN][entry.entry_id]["api"]
-
-    for hub_id, devices in devices_by_hub.items():
-        for device in devices:
-            for platform, meta in map_ajax_device(device):
-                if platform != "sensor":
-                    continue
-                if meta.get("device_class") == "temperature":
-                    entity = FireProtectSensor(device, meta, hub_id, api)
-                elif meta.get("device_class") == "door_temperature":
-                    entity = DoorProtectSensor(device, meta, hub_id, api)  
-                elif meta.get("device_class") == "motion_temperature":
-                    entity = MotionProtectSensor(device, meta, hub_id, api)              
-                else:
-                    entity = AjaxSensor(device, meta, hub_id, api)
-                entities.append(entity)
-
-    async_add_entities(entities)
-
-
-class AjaxSensor(SensorEntity):
-    def __init__(self, device, meta, hub_id, api):
-        self._device = device
+
+    @callback
+    def async_add_hubs(hub_ids):
+        async_add_entities(AjaxSuppressedWritesSensor(data["coordinators"][hub_id], hub_id) for hub_id in hub_ids)
+
+    async_setup_platform_items(
+        hass, entry, "sensor", async_add_entities, functools.partial(_build_entities, data)
+    )
+    async_add_hubs(list(data["coordinators"]))
+    async_add_entities(
+        AjaxApiMetricSensor(data["api"], entry.entry_id, *description) for description in API_METRIC_SENSORS
+    )
+    # Hubs discovered later arrive without reloading the entry
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, signal_new_entities(entry.entry_id, "hub_sensor"), async_add_hubs)
+    )
+
+
+def _build_entities(data, items):
+    entities = []
+    api = data["api"]
+    coordinators = data["coordinators"]
+
+    for hub_id, device, meta in items:
+        coordinator = coordinators[hub_id]
+        if (device.get("deviceType") or "").lower() == "lifequality":
+            entity = LifeQualitySensor(coordinator, device, meta, hub_id, api)
+        elif meta.get("device_class") == "temperature":
+            entity = FireProtectSensor(coordinator, device, meta, hub_id, api)
+        elif meta.get("device_class") == "door_temperature":
+            entity = DoorProtectSensor(coordinator, device, meta, hub_id, api)  
+        elif meta.get("device_class") == "motion_temperature":
+            entity = MotionProtectSensor(coordinator, device, meta, hub_id, api)              
+        else:
+            entity = AjaxSensor(coordinator, device, meta, hub_id, api)
+        entities.append(entity)
+    return entities
+
+
+class AjaxSensor(AjaxCoordinatorEntity, SensorEntity):
+    _state_fields = frozenset({"name", "battery", "firmware", "signal"})
+
+    def __init__(self, coordinator, device, meta, hub_id, api):
+        super().__init__(coordinator)
+        self._device_id = device.get("id")
         self.hub_id = hub_id
         self._meta = meta
         self._attr_name = device.get("deviceName") + f" ({device.get('id')})"
@@ -39,26 +109,26 @@ class AjaxSensor(SensorEntity):
         self._attr_device_class = meta.get("device_class")
         self._attr_native_unit_of_measurement = meta.get("unit")
         self.api = api
-        self._battery = None
-        self._native_value = None
+        self._update_name()
 
     @property
-    def native_value(self):     
-        return self._native_value
+    def native_value(self):
+        return None
+
     @property
     def extra_state_attributes(self):
+        state = self._device_state
         return {
-            "battery_level": self._battery,
+            "battery_level": state.battery if state else None,
+            "firmware": state.firmware if state else None,
+            "signal_level": state.signal if state else None,
+            "stale": self.coordinator.stale,
         }
 
-    async def async_update(self):
-        device_info = await self.api.get_device_info(self.hub_id, self._device.get('id'))
-        self._battery = device_info.get('batteryChargeLevelPercentage')
-
     @property
     def device_info(self):
         return {
-            "identifiers": {(DOMAIN, f"ajax_{self._device.get('id')}_{self._meta.get('device_class')}")},
+            "identifiers": {(DOMAIN, f"ajax_{self._device_id}_{self._meta.get('device_class')}")},
             "name": self._attr_name,
             "manufacturer": "Ajax",
             "model": self._meta.get("device_class", "Unknown"),
@@ -68,82 +138,141 @@ class AjaxSensor(SensorEntity):
 
 
 class FireProtectSensor(AjaxSensor):
-    def __init__(self, device, meta, hub_id, api):
-        super().__init__(device, meta, hub_id, api)
-        self._temperature = None
-
+    _state_fields = AjaxSensor._state_fields | {"temperature"}
 
     @property
     def native_value(self):
-        return self._temperature
-
-    @property
-    def extra_state_attributes(self):
-        attrs = super().extra_state_attributes.copy()
-        return attrs
+        state = self._device_state
+        return state.temperature if state else None
 
     @property
     def device_info(self):
         return {
-            "identifiers": {(DOMAIN, f"ajax_{self._device.get('id')}")},
+            "identifiers": {(DOMAIN, f"ajax_{self._device_id}")},
             "name": "Ajax FireProtectPlus",
             "manufacturer": "Ajax",
             "model": "FireProtectPlus",
         }
 
-    async def async_update(self):
-        await super().async_update() # updating in parent class
-        device_info = await self.api.get_device_info(self.hub_id, self._device.get('id'))
-        self._temperature = device_info.get('temperature')
-
             
             
 class DoorProtectSensor(AjaxSensor):
-    def __init__(self, device, meta, hub_id, api):
-        super().__init__(device, meta, hub_id, api)
-        self._temperature = None
+    _state_fields = AjaxSensor._state_fields | {"temperature"}
 
     @property
     def native_value(self):
-        return self._temperature
-
-
-    async def async_update(self):
-        await super().async_update() # updating in parent class
-        device_info = await self.api.get_device_info(self.hub_id, self._device.get('id'))
-        self._temperature = device_info.get('temperature')
-
+        state = self._device_state
+        return state.temperature if state else None
 
     @property
     def device_info(self):
         return {
-            "identifiers": {(DOMAIN, f"ajax_{self._device.get('id')}")},
+            "identifiers": {(DOMAIN, f"ajax_{self._device_id}")},
             "name": "Ajax DoorProtect",
             "manufacturer": "Ajax",
             "model": "DoorProtect",
         }
 
 class MotionProtectSensor(AjaxSensor):
-    def __init__(self, device, meta, hub_id, api):
-        super().__init__(device, meta, hub_id, api)
-        self._temperature = None
+    _state_fields = AjaxSensor._state_fields | {"temperature"}
+
+    @property
+    def native_value(self):
+        state = self._device_state
+        return state.temperature if state else None
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, f"ajax_{self._device_id}")},
+            "name": "Ajax MotionProtect",
+            "manufacturer": "Ajax",
+            "model": "MotionProtect",
+        }
+
+
+class LifeQualitySensor(AjaxSensor):
+    # Sensor device class -> DeviceState field holding its reading
+    _value_fields = {"temperature": "temperature", "humidity": "humidity", "carbon_dioxide": "co2"}
+
+    def __init__(self, coordinator, device, meta, hub_id, api):
+        super().__init__(coordinator, device, meta, hub_id, api)
+        self._value_field = self._value_fields.get(meta.get("device_class"))
+        if self._value_field is not None:
+            self._state_fields = AjaxSensor._state_fields | {self._value_field}
 
     @property
     def native_value(self):
-        return self._temperature
+        state = self._device_state
+        if state is None or self._value_field is None:
+            return None
+        return getattr(state, self._value_field)
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, f"ajax_{self._device_id}")},
+            "name": "Ajax LifeQuality",
+            "manufacturer": "Ajax",
+            "model": "LifeQuality",
+        }
+
+
+class AjaxSuppressedWritesSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic count of entity state writes skipped for a hub because nothing changed."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator, hub_id):
+        super().__init__(coordinator)
+        self.hub_id = hub_id
+        self._attr_name = f"Ajax Hub {hub_id} suppressed state writes"
+        self._attr_unique_id = f"ajax_{hub_id}_suppressed_writes"
+        self._attr_native_value = coordinator.suppressed_writes
+
+    @callback
+    def _handle_coordinator_update(self):
+        if self.coordinator.suppressed_writes == self._attr_native_value:
+            return
+        self._attr_native_value = self.coordinator.suppressed_writes
+        super()._handle_coordinator_update()
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, f"ajax_hub_{self.hub_id}")},
+            "name": "Ajax Hub",
+            "manufacturer": "Ajax",
+            "model": "Hub",
+        }
 
 
-    async def async_update(self):
-        await super().async_update() # updating in parent class
-        device_info = await self.api.get_device_info(self.hub_id, self._device.get('id'))
-        self._temperature = device_info.get('temperature')
+class AjaxApiMetricSensor(SensorEntity):
+    """Diagnostic view of one AjaxAPI request metric; polled, as it has no coordinator."""
 
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+
+    def __init__(self, api, entry_id, key, name, unit, state_class, value_fn):
+        self.api = api
+        self.entry_id = entry_id
+        self._value_fn = value_fn
+        self._attr_name = name
+        self._attr_unique_id = f"ajax_api_{entry_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self):
+        return self._value_fn(self.api)
 
     @property
     def device_info(self):
         return {
-            "identifiers": {(DOMAIN, f"ajax_{self._device.get('id')}")},
-            "name": "Ajax MotionProtect",
+            "identifiers": {(DOMAIN, f"ajax_api_{self.entry_id}")},
+            "name": "Ajax Cloud API",
             "manufacturer": "Ajax",
-            "model": "MotionProtect",
-        }
\ No newline at end of file
+            "model": "Cloud API",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
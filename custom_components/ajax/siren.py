@@ -1,20 +1,18 @@
+import functools
+
 from homeassistant.components.siren import SirenEntity
 from .const import DOMAIN
-from .device_mapper import map_ajax_device
+from .inventory import async_setup_platform_items
 
 async def async_setup_entry(hass, entry, async_add_entities):
-    devices_by_hub = hass.data[DOMAIN][entry.entry_id]["devices_by_hub"]
-    entities = []
-
-    for hub_id, devices in devices_by_hub.items():
-        for device in devices:
-            for platform, meta in map_ajax_device(device):
-                if platform != "siren":
-                    continue
-                entity = AjaxSiren(device, meta, hub_id)
-                entities.append(entity)
-
-    async_add_entities(entities)
+    data = hass.data[DOMAIN][entry.entry_id]
+    async_setup_platform_items(
+        hass, entry, "siren", async_add_entities, functools.partial(_build_entities, data)
+    )
+
+
+def _build_entities(data, items):
+    return [AjaxSiren(device, meta, hub_id) for hub_id, device, meta in items]
 
 
 class AjaxSiren(SirenEntity):
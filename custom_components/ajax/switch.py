@@ -1,26 +1,24 @@
+import functools
+
 from homeassistant.components.switch import SwitchEntity
 from .const import DOMAIN
-from .device_mapper import map_ajax_device
+from .inventory import async_setup_platform_items
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
-    devices_by_hub = hass.data[DOMAIN][entry.entry_id]["devices_by_hub"]
-    entities = []
+    data = hass.data[DOMAIN][entry.entry_id]
+    async_setup_platform_items(
+        hass, entry, "switch", async_add_entities, functools.partial(_build_entities, data)
+    )
 
-    for hub_id, devices in devices_by_hub.items():
-        for device in devices:
-            for platform, meta in map_ajax_device(device):
-                if platform != "switch":
-                    continue
-                entity = AjaxSwitch(device, meta, hub_id)
-                entities.append(entity)
 
-    async_add_entities(entities)
+def _build_entities(data, items):
+    return [AjaxSwitch(device, meta, hub_id) for hub_id, device, meta in items]
 
 
 
 class AjaxSwitch(SwitchEntity):
-    def __init__(self, device, hub_id):
+    def __init__(self, device, meta, hub_id):
         self._device = device
         self.hub_id = hub_id
         self._attr_name = device.get("deviceName") + f" ({device.get('id')})"
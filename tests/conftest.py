@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from benchmarks.mock_cloud import API_KEY, USER_ID, MockAjaxCloud
+from custom_components.ajax import api as ajax_api
+from custom_components.ajax.const import DOMAIN
+
+HUBS = 2
+DEVICES_PER_HUB = 10
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture
+async def cloud(monkeypatch):
+    cloud = MockAjaxCloud(hubs=HUBS, devices_per_hub=DEVICES_PER_HUB, latency=0, arming_delay=0.1)
+    monkeypatch.setattr(ajax_api.AjaxAPI, "base_url", await cloud.start())
+    yield cloud
+    await cloud.stop()
+
+
+@pytest.fixture
+async def entry(hass, cloud):
+    """A config entry set up against the mock cloud, with every hub's devices discovered."""
+    # The webhook transport is off, so its HTTP dependencies are not needed
+    hass.config.components.update({"http", "webhook"})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "session_token": cloud.session_token,
+            "refresh_token": cloud.refresh_token,
+            "user_id": USER_ID,
+            "api_key": API_KEY,
+            "token_created_at": time.time(),
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    # Devices are discovered in the background once the panels are up
+    while "complete" not in hass.data[DOMAIN][entry.entry_id]["setup_timing"]:
+        await asyncio.sleep(0.01)
+    await hass.async_block_till_done()
+    yield entry
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
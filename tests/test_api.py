@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from benchmarks.mock_cloud import API_KEY, USER_ID
+from custom_components.ajax.api import AjaxAPI, AjaxAPIError
+from custom_components.ajax.scheduler import PRIORITY_COMMAND
+
+REFRESH_ROUTE = "POST /api/refresh"
+HUB_ROUTE = "GET /api/user/{user_id}/hubs/{hub_id}"
+
+
+@pytest.fixture
+async def api(cloud):
+    async with aiohttp.ClientSession() as session:
+        yield AjaxAPI(
+            {
+                "session_token": cloud.session_token,
+                "refresh_token": cloud.refresh_token,
+                "user_id": USER_ID,
+                "api_key": API_KEY,
+                "token_created_at": time.time(),
+            },
+            session=session,
+        )
+
+
+async def test_token_refresh_is_not_retried(cloud, api):
+    """A failed refresh may have rotated the token server side, so it is never repeated."""
+    cloud.error_rate = 1.0
+    with pytest.raises(AjaxAPIError):
+        await api.update_refresh_token()
+    assert cloud.requests[REFRESH_ROUTE] == 1
+
+
+async def test_expired_token_is_refreshed_once_for_concurrent_callers(cloud, api):
+    """Distinct reads are not coalesced, so each checks the token; only one may refresh it."""
+    reads = [(hub_id, device["id"]) for hub_id, hub in cloud.hubs.items() for device in hub["devices"]]
+    api.session_created_at = 0
+    results = await asyncio.gather(*(api.get_device_info(hub_id, device_id) for hub_id, device_id in reads))
+    assert all(result["id"] == device_id for result, (_, device_id) in zip(results, reads))
+    assert cloud.requests[REFRESH_ROUTE] == 1
+
+
+async def test_identical_gets_share_one_request(cloud, api):
+    hub_id = next(iter(cloud.hubs))
+    cloud.latency = 0.1
+    await asyncio.gather(*(api.get_hub_info(hub_id) for _ in range(5)))
+    assert cloud.requests[HUB_ROUTE] == 1
+
+
+async def test_fresh_command_read_does_not_join_a_poll(cloud, api):
+    """An arming confirmation must not wait on, or reuse, a poll that began before the command."""
+    hub_id = next(iter(cloud.hubs))
+    cloud.latency = 0.1
+    poll = asyncio.ensure_future(api.get_hub_info(hub_id))
+    await asyncio.sleep(0)
+    await api.get_hub_info(hub_id, priority=PRIORITY_COMMAND, fresh=True)
+    await poll
+    assert cloud.requests[HUB_ROUTE] == 2
+
+
+async def test_invalidated_fetch_is_not_cached(cloud, api):
+    hub_id = next(iter(cloud.hubs))
+    cloud.latency = 0.1
+    poll = asyncio.ensure_future(api.get_hub_info(hub_id))
+    await asyncio.sleep(0)
+    # A command was sent while the read was in flight
+    api.invalidate_hub(hub_id)
+    await poll
+    assert api.cache.get(("hub_info", hub_id)) is None
@@ -0,0 +1,29 @@
+from homeassistant.const import EVENT_STATE_CHANGED
+
+from custom_components.ajax.const import DOMAIN
+
+from .conftest import HUBS
+
+DEVICES_ROUTE = "GET /api/user/{user_id}/hubs/{hub_id}/devices"
+DEVICE_ROUTE = "GET /api/user/{user_id}/hubs/{hub_id}/devices/{device_id}"
+HUB_ROUTE = "GET /api/user/{user_id}/hubs/{hub_id}"
+
+
+async def test_refresh_reads_each_hub_once(hass, cloud, entry):
+    """Every device entity updates from one device list request per hub, not one request each."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    changes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, changes.append)
+    # Every device reports new telemetry on the next read
+    cloud.churn = 1.0
+    cloud.reset_counts()
+
+    for hub_id, coordinator in entry_data["coordinators"].items():
+        entry_data["api"].invalidate_hub(hub_id)
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert cloud.requests[DEVICES_ROUTE] == HUBS
+    assert cloud.requests[HUB_ROUTE] == HUBS
+    assert cloud.requests[DEVICE_ROUTE] == 0
+    assert len(changes) > HUBS
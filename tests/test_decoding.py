@@ -0,0 +1,51 @@
+import io
+
+import pytest
+
+from custom_components.ajax import decoding
+
+
+class FakeStream:
+    def __init__(self, body):
+        self._body = io.BytesIO(body)
+
+    async def read(self, size=-1):
+        return self._body.read(size)
+
+
+class FakeResponse:
+    """Just the parts of aiohttp's ClientResponse that iter_devices reads."""
+
+    def __init__(self, body):
+        self._body = body
+        self.content = FakeStream(body)
+
+    async def read(self):
+        return self._body
+
+
+async def _devices(body):
+    return [device async for device in decoding.iter_devices(FakeResponse(body))]
+
+
+@pytest.fixture(params=["ijson", "json"])
+def parser(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(decoding, "ijson", None)
+    elif decoding.ijson is None:
+        pytest.skip("ijson is not installed")
+    return request.param
+
+
+async def test_devices_are_trimmed(parser):
+    assert await _devices(b'[{"id": "1", "deviceName": "Door", "tampered": false}]') == [
+        {"id": "1", "deviceName": "Door"}
+    ]
+
+
+@pytest.mark.parametrize(
+    "body", [b"", b'[{"id": "1",', b"<html>502 Bad Gateway</html>", b'{"message": "error"}']
+)
+async def test_malformed_body_raises_value_error(parser, body):
+    with pytest.raises(ValueError):
+        await _devices(body)
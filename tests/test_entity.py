@@ -0,0 +1,28 @@
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.ajax.const import DOMAIN
+
+
+async def test_registry_rename_reaches_state_machine(hass, entry):
+    """Skipping unchanged coordinator writes must not swallow HA's own writes."""
+    coordinator = next(iter(hass.data[DOMAIN][entry.entry_id]["coordinators"].values()))
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id("alarm_control_panel", DOMAIN, f"ajax_{coordinator.hub_id}_alarm")
+
+    registry.async_update_entity(entity_id, name="Front door panel")
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).attributes["friendly_name"] == "Front door panel"
+
+
+async def test_unchanged_refresh_is_not_written(hass, entry):
+    coordinator = next(iter(hass.data[DOMAIN][entry.entry_id]["coordinators"].values()))
+    suppressed = coordinator.suppressed_writes
+
+    # Same hub state, every device entity asked to check itself
+    coordinator.hub_changed = True
+    coordinator.changed_fields = None
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done()
+
+    assert coordinator.suppressed_writes > suppressed
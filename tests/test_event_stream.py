@@ -0,0 +1,48 @@
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.ajax.const import DOMAIN
+from custom_components.ajax.event_stream import AjaxEventStream, LocalEventTransport
+
+HUB_ROUTE = "GET /api/user/{user_id}/hubs/{hub_id}"
+
+
+def _event(hub_id, tag, device=None):
+    event = {"hubId": hub_id, "eventTag": tag, "timestamp": 1700000000000}
+    if device is not None:
+        event.update(sourceObjectId=device["id"], sourceObjectName=device["deviceName"])
+    return {"event": event}
+
+
+async def test_pushed_events_reach_coordinator_and_entities(hass, cloud, entry):
+    hub_id, hub = next(iter(cloud.hubs.items()))
+    remote = next(device for device in hub["devices"] if device["deviceType"] == "SpaceControl")
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinators"][hub_id]
+    registry = er.async_get(hass)
+    event_entity_id = next(
+        entity.entity_id
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id)
+        if entity.domain == "event" and entity.unique_id.startswith(f"ajax_{remote['id']}_")
+    )
+    assert not coordinator.push_active
+
+    transport = LocalEventTransport()
+    stream = AjaxEventStream(hass, entry.entry_id, transport)
+    await stream.async_start()
+    cloud.reset_counts()
+
+    await transport.async_publish(_event(hub_id, "Arm"))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.push_active
+    # The hub is read again right away rather than on the next poll
+    assert cloud.requests[HUB_ROUTE] >= 1
+
+    await transport.async_publish(_event(hub_id, "Panic", remote))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get(event_entity_id)
+    assert state.attributes["event_type"] == "panic"
+    assert state.attributes["tag"] == "Panic"
+    assert stream.events_received == 2
+
+    await stream.async_stop()
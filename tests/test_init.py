@@ -0,0 +1,24 @@
+from homeassistant.config_entries import SOURCE_REAUTH
+from homeassistant.exceptions import ConfigEntryAuthFailed
+import pytest
+
+from custom_components.ajax.const import DOMAIN
+
+
+async def test_rejected_refresh_token_starts_reauth(hass, cloud, entry):
+    """A 200 /refresh reply without tokens means the refresh token is dead, not a transient error."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    api = entry_data["api"]
+    hub_id, coordinator = next(iter(entry_data["coordinators"].items()))
+    cloud.reject_refresh = True
+    api.session_created_at = 0
+
+    with pytest.raises(ConfigEntryAuthFailed):
+        await api.update_refresh_token()
+
+    api.invalidate_hub(hub_id)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert any(flow["context"]["source"] == SOURCE_REAUTH for flow in flows)
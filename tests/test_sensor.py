@@ -0,0 +1,21 @@
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.ajax.const import DOMAIN
+
+
+async def test_life_quality_readings_follow_every_refresh(hass, cloud, entry):
+    hub_id, hub = next(iter(cloud.hubs.items()))
+    device = next(device for device in hub["devices"] if device["deviceType"] == "LifeQuality")
+    registry = er.async_get(hass)
+    humidity = registry.async_get_entity_id("sensor", DOMAIN, f"ajax_{device['id']}_humidity")
+    co2 = registry.async_get_entity_id("sensor", DOMAIN, f"ajax_{device['id']}_carbon_dioxide")
+    assert hass.states.get(humidity).state == "45"
+    assert hass.states.get(co2).state == "600"
+
+    device["co2"] = 950
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    entry_data["api"].invalidate_hub(hub_id)
+    await entry_data["coordinators"][hub_id].async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(co2).state == "950"